@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""
+Check that the batched solve of compute_batch gives the same results
+as the solves of each condition on the bundled datasets.
+
+The perturbations of each dataset are checked as they are,
+and also replaced by isolation type perturbations only
+and by alternating node and isolation type perturbations,
+for which Data.has_link_perturb is False.
+
+Usage: python check_batch.py
+"""
+
+import sys
+import copy
+
+import numpy as np
+
+import sfa
+from sfa.algorithms.sp import SignalPropagation
+
+
+keys = [
+    'BORISOV_2009',
+    'MOLINELLI_2013',
+    'NELANDER_2008',
+    'PEZZE_2012',
+    'SCHLIEMANN_2011',
+]
+
+configs = [
+    dict(),
+    dict(use_sparse=True),
+    dict(restrict_outputs=True),
+    dict(solver='auto'),
+]
+
+tol = 1e-10
+
+
+def simulate(data, **params):
+    alg = SignalPropagation('SP')
+    alg.data = data
+    for name, val in params.items():
+        setattr(alg.params, name, val)
+    alg.initialize()
+    alg.compute_batch()
+    return alg.result.df_sim.values
+
+
+def replace_types(data, types, val_iso=0.3):
+    """Create a copy of data, whose perturbation types are
+       assigned from types in turn.
+    """
+    data_new = copy.copy(data)
+    df_ptb = data.df_ptb.copy()
+    df_ptb['Type'] = [types[i % len(types)] for i in range(len(df_ptb))]
+    df_ptb['Value'] = [val_iso if t == 'isolation' else -1.0
+                       for t in df_ptb['Type']]
+    data_new.df_ptb = df_ptb
+    return data_new
+
+
+def main():
+    ds = sfa.DataSet()
+    num_failed = 0
+    for key in keys:
+        data = ds.create(key)
+        if isinstance(data, dict):
+            data = sfa.get_avalue(data)
+
+        variants = [('original', data),
+                    ('isolation', replace_types(data, ['isolation'])),
+                    ('node+isolation',
+                     replace_types(data, ['node', 'isolation']))]
+
+        for name, data_var in variants:
+            sim_ref = simulate(data_var, use_batch_solve=False)
+            for cfg in configs:
+                sim = simulate(data_var, use_batch_solve=True, **cfg)
+                diff = np.abs(sim - sim_ref).max()
+                status = "ok"
+                if not diff <= tol:
+                    status = "FAILED"
+                    num_failed += 1
+                print("%s (%s) %s: %.2e %s"
+                      % (key, name, cfg, diff, status))
+            # end of for
+        # end of for
+    # end of for
+
+    return 1 if num_failed > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
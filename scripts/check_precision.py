@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+Check that the single precision mode does not change the sign accuracy,
+``sfa.calc_accuracy``, on the bundled datasets that have experimental data.
+
+The accuracy of each configuration in single precision is compared with
+that in double precision. A changed sign is reported as a failure, unless
+the sign in single precision agrees with the exact solution
+in double precision (i.e., the double precision result of
+the iterative method is the one that has not converged to the sign).
+
+Usage: python check_precision.py
+"""
+
+import sys
+
+import numpy as np
+
+import sfa
+from sfa.algorithms.sp import SignalPropagation
+
+
+configs = [
+    dict(),
+    dict(apply_weight_norm=True),
+    dict(solver='iterative', apply_weight_norm=True),
+]
+
+configs_single = [
+    dict(precision='single'),
+    dict(precision='single', num_refinements=2),
+]
+
+
+def simulate(data, **params):
+    alg = SignalPropagation('SP')
+    alg.data = data
+    for name, val in params.items():
+        setattr(alg.params, name, val)
+    alg.initialize()
+    alg.compute_batch()
+    return alg.result.df_sim
+
+
+def get_mdata():
+    ds = sfa.DataSet()
+    ds.create()
+    mdata = {}
+    for key, obj in ds.items():
+        if isinstance(obj, dict):
+            mdata.update(obj)
+        else:
+            mdata[key] = obj
+    # end of for
+    return {key: data for key, data in mdata.items()
+            if data.df_exp is not None}
+
+
+def main():
+    mdata = get_mdata()
+    print("%d datasets with experimental data" % (len(mdata)))
+
+    num_failed = 0
+    for cfg in configs:
+        num_changed = 0
+        max_rel = 0.0
+        for key in sorted(mdata):
+            data = mdata[key]
+            df_double = simulate(data, **cfg)
+            acc_double = sfa.calc_accuracy(df_double, data.df_exp)
+            df_exact = None
+            for cfg_single in configs_single:
+                params = dict(cfg, **cfg_single)
+                df_single = simulate(data, **params)
+                diff = np.abs(df_single.values - df_double.values).max()
+                max_rel = max(max_rel,
+                              diff / np.abs(df_double.values).max())
+
+                acc_single = sfa.calc_accuracy(df_single, data.df_exp)
+                if acc_single == acc_double:
+                    continue
+
+                num_changed += 1
+                if df_exact is None:
+                    params_exact = dict(cfg, solver='exact')
+                    df_exact = simulate(data, **params_exact)
+
+                changed = np.sign(df_single.values) \
+                          != np.sign(df_double.values)
+                wrong = np.sign(df_single.values[changed]) \
+                        != np.sign(df_exact.values[changed])
+                status = "FAILED" if np.any(wrong) else "toward exact"
+                if np.any(wrong):
+                    num_failed += 1
+
+                print("%s %s %s: %f -> %f (%s)"
+                      % (key, cfg, cfg_single,
+                         acc_double, acc_single, status))
+            # end of for
+        # end of for
+        print("%s: %d changed, max relative deviation %.2e"
+              % (cfg, num_changed, max_rel))
+    # end of for
+
+    return 1 if num_failed > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
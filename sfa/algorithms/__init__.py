@@ -2,6 +2,11 @@
 
 from .np import NetworkPropagation
 from .np import NetworkPropagationParameterSet
+from .np import TrajectoryRecorder
 
 from .sp import SignalPropagation
-from .sp import SignalPropagationParameterSet
\ No newline at end of file
+from .sp import SignalPropagationParameterSet
+from .sp import ReducedNetwork
+
+from .cache import FactorizationCache
+from .cache import get_factorization_cache
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import hashlib
+import threading
+
+import numpy as np
+import scipy as sp
+import scipy.sparse
+
+__all__ = ['FactorizationCache', 'get_factorization_cache', 'hash_matrix']
+
+
+class FactorizationCache(object):
+    """A cache of the prepared solvers (e.g., LU factorizations),
+    which are evicted in the least recently used order
+    when their total size exceeds the memory budget.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Memory budget in bytes. The default value is 256 MiB.
+
+    Attributes
+    ----------
+    hits : int
+        Number of the lookups that found a prepared solver.
+    misses : int
+        Number of the lookups that did not find a prepared solver.
+    evictions : int
+        Number of the solvers evicted for the memory budget.
+    nbytes : int
+        Total size of the cached solvers in bytes.
+    """
+
+    def __init__(self, max_bytes=256*1024**2):
+        self._lock = threading.Lock()
+        self._items = collections.OrderedDict()  # key -> (obj, nbytes)
+        self.clear()
+        self.max_bytes = max_bytes
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, val):
+        if not isinstance(val, int):
+            raise TypeError("max_bytes should be an integer.")
+        elif val < 0:
+            raise ValueError("max_bytes should be non-negative.")
+
+        with self._lock:
+            self._max_bytes = val
+            self._evict()
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def evictions(self):
+        return self._evictions
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key):
+        """Get the solver of key, which becomes the most recently used.
+           None is returned if it is not cached.
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            del self._items[key]
+            self._items[key] = item
+            return item[0]
+
+    def put(self, key, obj, nbytes):
+        """Cache the solver of key, whose size is nbytes.
+           It is not cached if it exceeds the memory budget by itself.
+        """
+        with self._lock:
+            if key in self._items:
+                self._nbytes -= self._items.pop(key)[1]
+
+            if nbytes > self._max_bytes:
+                return
+
+            self._items[key] = (obj, nbytes)
+            self._nbytes += nbytes
+            self._evict()
+
+    def clear(self):
+        """Remove all solvers and reset the statistics.
+        """
+        with self._lock:
+            self._items.clear()
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def get_stats(self):
+        """Get the statistics of the cache in a dict.
+        """
+        return {'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'size': len(self._items),
+                'nbytes': self._nbytes,
+                'max_bytes': self._max_bytes}
+
+    def _evict(self):
+        while self._nbytes > self._max_bytes:
+            _, (_, nbytes) = self._items.popitem(last=False)
+            self._nbytes -= nbytes
+            self._evictions += 1
+    # end of def _evict
+
+# end of class FactorizationCache
+
+
+_factorization_cache = FactorizationCache()
+
+
+def get_factorization_cache():
+    """Get the process-wide cache of the prepared solvers.
+    """
+    return _factorization_cache
+
+
+def hash_matrix(W):
+    """Get the hash of the contents of a dense or CSR matrix.
+    """
+    h = hashlib.sha1()
+    if sp.sparse.issparse(W):
+        W = sp.sparse.csr_matrix(W)
+        h.update(b'csr')
+        arrays = (W.indptr, W.indices, W.data)
+    else:
+        h.update(b'dense')
+        arrays = (np.ascontiguousarray(W),)
+
+    h.update(str((W.shape, W.dtype.str)).encode())
+    for arr in arrays:
+        h.update(np.ascontiguousarray(arr).view(np.uint8))
+
+    return h.hexdigest()
@@ -5,12 +5,18 @@ import sys
 if sys.version_info <= (2, 8):
     from builtins import super
 
+import collections
+import itertools
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
+import scipy as sp
+import scipy.sparse
 import pandas as pd
 
 import sfa.base
 import sfa.utils
+from .cache import hash_matrix
 
 
 class NetworkPropagationParameterSet(sfa.base.ParameterSet):
@@ -26,6 +32,19 @@ class NetworkPropagationParameterSet(sfa.base.ParameterSet):
     use_rel_change : bool
     exsol_forbidden : bool
     no_inputs : bool
+    use_batch_solve : bool
+    use_sparse : bool
+    use_lowrank_update : bool
+    solver : str
+    krylov_method : str
+    anderson_depth : int
+    precision : str
+    num_refinements : int
+    warm_start : str
+    n_threads : int
+    restrict_outputs : bool
+    use_cache : bool
+    use_reduction : bool
     """
 
     def __init__(self):
@@ -41,6 +60,19 @@ class NetworkPropagationParameterSet(sfa.base.ParameterSet):
         self._use_rel_change = False
         self._exsol_forbidden = False
         self._no_inputs = False
+        self._use_batch_solve = False
+        self._use_sparse = False
+        self._use_lowrank_update = False
+        self._solver = 'exact'
+        self._krylov_method = 'gmres'
+        self._anderson_depth = 0
+        self._precision = 'double'
+        self._num_refinements = 0
+        self._warm_start = 'none'
+        self._n_threads = 1
+        self._restrict_outputs = False
+        self._use_cache = True
+        self._use_reduction = False
 
     @property
     def alpha(self):
@@ -127,9 +159,379 @@ class NetworkPropagationParameterSet(sfa.base.ParameterSet):
         if not isinstance(val, bool):
             raise TypeError("no_inputs is bool type.")
         self._no_inputs = val
+
+    @property
+    def use_batch_solve(self):
+        """Solve all the conditions of a batch at once,
+           stacking the basal activities into a single matrix.
+           It is applied only to the data without link type perturbations.
+        """
+        return self._use_batch_solve
+
+    @use_batch_solve.setter
+    def use_batch_solve(self, val):
+        if not isinstance(val, bool):
+            raise TypeError("use_batch_solve should be a bool type value.")
+        self._use_batch_solve = val
+
+    @property
+    def use_sparse(self):
+        """Store the weight matrix in CSR format and
+           use sparse matrix operations for the propagation.
+        """
+        return self._use_sparse
+
+    @use_sparse.setter
+    def use_sparse(self, val):
+        if not isinstance(val, bool):
+            raise TypeError("use_sparse should be a bool type value.")
+        self._use_sparse = val
+
+    @property
+    def use_lowrank_update(self):
+        """Apply link and isolation type perturbations as low-rank updates
+           of the factorization for the control condition
+           (Sherman-Morrison-Woodbury formula),
+           instead of preparing the exact solution for every condition.
+        """
+        return self._use_lowrank_update
+
+    @use_lowrank_update.setter
+    def use_lowrank_update(self, val):
+        if not isinstance(val, bool):
+            raise TypeError("use_lowrank_update should be a bool type value.")
+        self._use_lowrank_update = val
+
+    @property
+    def solver(self):
+        """Solver for the activity at steady-state,
+           {'exact', 'iterative', 'krylov', 'scc', 'auto'}.
+           'exact' uses the exact solution if it is available
+           and not forbidden, otherwise the iterative method is used.
+           'krylov' solves the linear system of the steady-state
+           with a Krylov subspace method preconditioned by incomplete LU.
+           'scc' solves the strongly connected components of the network
+           one after another in topological order, where only
+           the components with feedback loops are factorized.
+           'auto' chooses the solver, use_sparse and use_batch_solve
+           in initialize() based on the size and density of the network,
+           the estimated spectral radius of aW and the number of
+           conditions. The choice is recorded in
+           ``NetworkPropagation.solver_choice``.
+           The default value is 'exact'.
+        """
+        return self._solver
+
+    @solver.setter
+    def solver(self, val):
+        if val not in ('exact', 'iterative', 'krylov', 'scc', 'auto'):
+            raise ValueError("Undefined solver: %s" % (val))
+        self._solver = val
+
+    @property
+    def krylov_method(self):
+        """Krylov subspace method for the 'krylov' solver,
+           {'gmres', 'bicgstab'}. The default value is 'gmres'.
+        """
+        return self._krylov_method
+
+    @krylov_method.setter
+    def krylov_method(self, val):
+        if val not in ('gmres', 'bicgstab'):
+            raise ValueError("Undefined Krylov method: %s" % (val))
+        self._krylov_method = val
+
+    @property
+    def anderson_depth(self):
+        """Number of previous iterates used by Anderson mixing
+           to accelerate the iterative method.
+           The default value is 0, which means no acceleration.
+        """
+        return self._anderson_depth
+
+    @anderson_depth.setter
+    def anderson_depth(self, val):
+        if not isinstance(val, int):
+            raise TypeError("anderson_depth is a integer type value.")
+        elif val < 0:
+            raise ValueError("anderson_depth should not be negative.")
+        else:
+            self._anderson_depth = val
+
+    @property
+    def precision(self):
+        """Floating-point precision of the factorization and the iteration,
+           {'double', 'single'}.
+           The 'single' precision halves the memory traffic, and its results
+           agree with those of the 'double' precision within about 1e-6
+           (relative), which is improved by num_refinements.
+           The default value is 'double'.
+        """
+        return self._precision
+
+    @precision.setter
+    def precision(self, val):
+        if val not in ('double', 'single'):
+            raise ValueError("precision should be 'double' or 'single'.")
+        self._precision = val
+
+    @property
+    def num_refinements(self):
+        """Number of iterative refinement steps,
+           which are applied to the solution in single precision.
+           Each step computes the residual of (I-aW)*x = (1-a)b
+           in double precision, and corrects x by the solution of
+           (I-aW)*d = r in single precision, using the factorization
+           or the iterative method.
+           The default value is 0.
+        """
+        return self._num_refinements
+
+    @num_refinements.setter
+    def num_refinements(self, val):
+        if not isinstance(val, int):
+            raise TypeError("num_refinements is a integer type value.")
+        elif val < 0:
+            raise ValueError("num_refinements should not be negative.")
+        else:
+            self._num_refinements = val
+
+    @property
+    def warm_start(self):
+        """Initial state of the iterative method in computing a batch,
+           {'none', 'control', 'previous'}.
+           'none' starts from the basal activity of each condition.
+           'control' starts from the steady-state of the control condition.
+           'previous' starts from the steady-state of the previous
+           condition, where the conditions are computed in the order
+           of their perturbation targets, so that similar conditions
+           are computed one after another.
+           The default value is 'none'.
+        """
+        return self._warm_start
+
+    @warm_start.setter
+    def warm_start(self, val):
+        if val not in ('none', 'control', 'previous'):
+            raise ValueError("warm_start should be one of "
+                             "'none', 'control' and 'previous'.")
+        self._warm_start = val
+
+    @property
+    def n_threads(self):
+        """Number of threads for computing the conditions of a batch.
+           The conditions are split into n_threads chunks,
+           and each chunk is computed with its own copies of b and W.
+           It is not applied to the batched solve (use_batch_solve).
+           The default value is 1.
+        """
+        return self._n_threads
+
+    @n_threads.setter
+    def n_threads(self, val):
+        if not isinstance(val, int):
+            raise TypeError("n_threads is a integer type value.")
+        elif val < 1:
+            raise ValueError("n_threads should be greater than 0.")
+        else:
+            self._n_threads = val
+
+    @property
+    def restrict_outputs(self):
+        """Compute only the activities of the observed nodes
+           (data.iadj_to_idf) from the rows of (I-aW)^-1 for them,
+           which are obtained by the transposed solves once per W.
+           Each condition costs O(k*|perturbed|) for k observed nodes.
+           It is applied only to the exact solution
+           and the data without link type perturbations.
+        """
+        return self._restrict_outputs
+
+    @restrict_outputs.setter
+    def restrict_outputs(self, val):
+        if not isinstance(val, bool):
+            raise TypeError("restrict_outputs should be a bool type value.")
+        self._restrict_outputs = val
+
+    @property
+    def use_cache(self):
+        """Share the prepared exact solution through the process-wide
+           cache (``sfa.algorithms.cache.get_factorization_cache()``),
+           where it is found by the hash of the contents of W and alpha.
+           The same network is factorized only once
+           by the algorithm objects in a process.
+           The default value is True.
+        """
+        return self._use_cache
+
+    @use_cache.setter
+    def use_cache(self, val):
+        if not isinstance(val, bool):
+            raise TypeError("use_cache should be a bool type value.")
+        self._use_cache = val
+
+    @property
+    def use_reduction(self):
+        """Eliminate the nodes other than the observed nodes,
+           the inputs and the perturbation targets exactly
+           by the Schur complement of (I-aW), and solve
+           the reduced network instead of the solver.
+           The activities of the eliminated nodes are not computed.
+           The default value is False.
+        """
+        return self._use_reduction
+
+    @use_reduction.setter
+    def use_reduction(self, val):
+        if not isinstance(val, bool):
+            raise TypeError("use_reduction should be a bool type value.")
+        self._use_reduction = val
 # end of def class ParameterSet
 
 
+# Solver and settings chosen by the 'auto' solver with the reason
+SolverChoice = collections.namedtuple('SolverChoice', ['solver',
+                                                       'use_sparse',
+                                                       'use_batch_solve',
+                                                       'reason'])
+
+# Thresholds of the 'auto' solver
+_AUTO_MAX_DENSE_NODES = 2000  # Larger networks can be stored in CSR format.
+_AUTO_MAX_SPARSE_DENSITY = 0.01  # Density of CSR format.
+_AUTO_MAX_SPLU_NODES = 50000  # Larger networks are not factorized.
+_AUTO_MAX_RADIUS = 0.95  # Spectral radius of aW for the iterative method.
+
+# Versions of W, which are never reused
+_W_versions = itertools.count(1)
+
+# Members of NetworkPropagation that depend on W,
+# which are saved and restored together with W.
+_W_DEPENDENT_MEMBERS = ('_W', '_W_version', '_W_perturbed',
+                        '_M', '_exsol_key',
+                        '_krylov_op', '_krylov_precond', '_krylov_key',
+                        '_scc_levels', '_scc_key',
+                        '_R_obs', '_R_obs_key',
+                        '_reduced', '_reduction_key',
+                        '_W_single', '_W_single_version',
+                        '_W_hash', '_W_hash_version')
+
+
+def _estimate_spectral_radius(W, num_iter=30):
+    """Estimate the upper bound of the spectral radius of W.
+       The spectral radius of W is not greater than that of |W|,
+       which is bounded by max_i (|W|x)_i / x_i for any positive x
+       (Collatz-Wielandt). x is refined by the power iteration of |W|.
+    """
+    W_abs = abs(W)
+    x = np.ones(W.shape[0])
+    radius = np.inf
+    for i in range(num_iter):
+        y = W_abs.dot(x)
+        radius = min(radius, np.max(y / x))
+        y_max = np.max(y)
+        if y_max == 0:  # Nilpotent |W|
+            return 0.0
+        x = y/y_max + 1e-6  # Keep x positive
+    # end of for
+
+    return radius
+
+
+def _scale_matrix(W, r=None, c=None):
+    """Multiply the rows and columns of a dense or CSR weight matrix
+       in place, which results in diag(r)*W*diag(c).
+    """
+    if sp.sparse.issparse(W):
+        if r is not None:
+            W.data *= np.repeat(r, np.diff(W.indptr))
+        if c is not None:
+            W.data *= c[W.indices]
+    else:
+        if r is not None:
+            W *= r[:, None]
+        if c is not None:
+            W *= c[None, :]
+
+
+class TrajectoryRecorder(object):
+    """Record the trajectory of states into a preallocated array.
+
+    Parameters
+    ----------
+    num_nodes : int
+        Number of nodes in a state.
+    lim_iter : int
+        Number of maximum iterations to be recorded.
+    step : int, optional
+        Record every step-th iteration.
+        The initial state (0th iteration) is always recorded.
+    nodes : list of int, optional
+        Indices of nodes to be recorded. All nodes are recorded
+        if it is not given.
+    fpath : str, optional
+        Path of the .npy file for a memory-mapped array.
+        The array is held in memory if it is not given.
+
+    Attributes
+    ----------
+    trj : numpy.ndarray
+        2D array where the row represents a recorded state.
+    iters : numpy.ndarray
+        Iteration numbers of the recorded states.
+    """
+
+    def __init__(self, num_nodes, lim_iter, step=1, nodes=None, fpath=None):
+        if not isinstance(step, int) or step < 1:
+            raise ValueError("step should be a positive integer.")
+
+        self._step = step
+        self._nodes = nodes
+        if nodes is not None:
+            num_nodes = len(nodes)
+
+        self._max_rows = lim_iter//step + 1
+        if fpath:
+            self._arr = np.lib.format.open_memmap(
+                fpath, mode='w+', dtype=np.float64,
+                shape=(self._max_rows, num_nodes))
+        else:
+            # The in-memory array grows by doubling up to the maximum.
+            self._arr = np.empty((min(self._max_rows, 64), num_nodes),
+                                 dtype=np.float64)
+
+        self._iters = np.empty(self._max_rows, dtype=np.int64)
+        self._cnt = 0
+
+    @property
+    def trj(self):
+        return self._arr[:self._cnt]
+
+    @property
+    def iters(self):
+        return self._iters[:self._cnt]
+
+    def record(self, num_iter, x):
+        """Record the state, x, of the num_iter-th iteration.
+        """
+        if num_iter % self._step != 0 or self._cnt >= self._max_rows:
+            return
+
+        if self._cnt == self._arr.shape[0]:
+            num_rows = min(2*self._arr.shape[0], self._max_rows)
+            arr = np.empty((num_rows, self._arr.shape[1]), dtype=np.float64)
+            arr[:self._cnt] = self._arr
+            self._arr = arr
+
+        if self._nodes is None:
+            self._arr[self._cnt] = x
+        else:
+            self._arr[self._cnt] = x[self._nodes]
+
+        self._iters[self._cnt] = num_iter
+        self._cnt += 1
+# end of class TrajectoryRecorder
+
+
 class NetworkPropagation(sfa.base.Algorithm):
     """A base class that defines the basic functionality of
        network propagation algorithms.
@@ -152,8 +554,26 @@ class NetworkPropagation(sfa.base.Algorithm):
         self._b = None
 
         self._exsol_avail = False  # The exact solution is available.
-        self._M = None  # A matrix for getting the exact solution.
-        self._weight_matrix_invalidated = True
+        self._M = None  # A factorization for getting the exact solution.
+        self._W_version = 0  # Renewed whenever W is assigned.
+        self._exsol_key = None  # (W version, alpha) of the prepared _M.
+        self._krylov_op = None  # (I-aW) for the Krylov subspace method.
+        self._krylov_precond = None  # Preconditioner of the Krylov method.
+        self._krylov_key = None  # (W version, alpha) of the preconditioner.
+        self._krylov_info = None  # Iteration numbers and residuals.
+        self._scc_levels = None  # Components of W in topological order.
+        self._reduced = None  # Reduced network onto the kept nodes.
+        self._reduction_key = None  # Key of _reduced by _get_reduction_key
+        self._scc_key = None  # (W version, alpha) of the components.
+        self._R_obs = None  # Rows of M for the observed nodes.
+        self._R_obs_key = None  # (W version, alpha, observed nodes) of _R_obs.
+        self._W_single = None  # W in single precision
+        self._W_single_version = None
+        self._solver_choice = None  # SolverChoice of the 'auto' solver.
+        self._W_hash = None  # Hash of the contents of W
+        self._W_hash_version = None
+        self._W_perturbed = False  # W is perturbed from the control.
+        self._copy_cached = False  # Cached dense factors are copied.
 
         self._result = sfa.base.Result()
 
@@ -173,36 +593,251 @@ class NetworkPropagation(sfa.base.Algorithm):
 
     @W.setter
     def W(self, mat):
+        # The prepared exact solution is invalidated by a new W.
+        # W should be reassigned after it is modified in place.
+        # The versions are never reused, so that W and the solutions
+        # prepared for it can be restored together (see _save_prepared).
         self._W = mat
-        self._weight_matrix_invalidated = True
+        self._W_version = next(_W_versions)
 
     # end of _W.setter
 
+    def _save_prepared(self):
+        """Save W and the solutions prepared for it,
+           which are restored by _restore_prepared()
+           instead of preparing them again.
+        """
+        return {name: getattr(self, name) for name in _W_DEPENDENT_MEMBERS}
+
+    def _restore_prepared(self, state):
+        """Restore W and the solutions saved by _save_prepared().
+        """
+        for name, val in state.items():
+            setattr(self, name, val)
+
+    def _get_W_hash(self):
+        """Get the hash of the contents of W,
+           which is reused until W is assigned again.
+        """
+        if self._W_hash_version != self._W_version:
+            self._W_hash = hash_matrix(self._W)
+            self._W_hash_version = self._W_version
+        return self._W_hash
+
+    def _get_cache_key(self, kind):
+        """Get the key of the prepared solver of the kind
+           in the process-wide cache, which consists of
+           the hash of W, alpha and the precision.
+        """
+        return (kind, self._get_W_hash(),
+                self._params.alpha, self._params.precision)
+
+    @property
+    def reduced_network(self):
+        """The reduced network onto the observed nodes, the inputs and
+           the perturbation targets, which is prepared if use_reduction
+           is True. A saved reduced network of the same W and alpha
+           can be assigned instead of preparing it again.
+        """
+        return self._reduced
+
+    @reduced_network.setter
+    def reduced_network(self, obj):
+        if obj.alpha != self._params.alpha:
+            raise ValueError("The reduced network is prepared "
+                             "for alpha=%g." % (obj.alpha))
+        elif obj.W_hash != self._get_W_hash():
+            raise ValueError("The reduced network is prepared "
+                             "for a different W.")
+
+        missing = np.setdiff1d(self._get_reduction_nodes(), obj.inds)
+        if missing.size > 0:
+            raise ValueError("The reduced network does not have "
+                             "%d necessary nodes." % (missing.size))
+
+        self._reduced = obj
+        self._reduction_key = self._get_reduction_key()
+
+    def _get_reduction_nodes(self):
+        """Get the sorted indices of the nodes kept by the reduction:
+           the observed nodes, the inputs and the perturbation targets.
+        """
+        plan = self.data.plan
+        inds = [np.asarray(self.data.iadj_to_idf, dtype=np.int64),
+                plan.inds_input]
+        inds.extend(plan.get_targets(i) for i in range(len(plan)))
+        return np.unique(np.concatenate(inds))
+
+    def _get_reduction_key(self):
+        """Get the key of the reduced network, which consists of
+           the version of W, alpha, the conditions and the observed nodes.
+        """
+        return (self._W_version, self._params.alpha, self.data.plan,
+                tuple(self.data.iadj_to_idf))
+
+    def _is_reduction_outdated(self):
+        """Check whether the prepared reduced network does not
+           correspond to the current W, alpha, conditions and
+           observed nodes.
+        """
+        return self._reduction_key != self._get_reduction_key()
+
+    @property
+    def solver_choice(self):
+        """The object of ``SolverChoice`` that has the solver
+           and the settings chosen by the 'auto' solver with the reason.
+           It is None if the solver is not 'auto'.
+        """
+        if self._params.solver != 'auto':
+            return None
+        return self._solver_choice
+
+    def _get_setting(self, name):
+        """Get the effective value of the solver, use_sparse or
+           use_batch_solve, which is chosen by the 'auto' solver
+           instead of the parameter.
+        """
+        if self._params.solver == 'auto' and self._solver_choice is not None:
+            return getattr(self._solver_choice, name)
+        return getattr(self._params, name)
+
+    def _choose_solver(self, W, exsol_avail=True):
+        """Choose the solver for W, which is stored
+           in CSR format if it is large and sparse enough.
+
+        Parameters
+        ----------
+        W : numpy.ndarray or scipy.sparse.csr_matrix
+            Weight matrix.
+        exsol_avail : bool, optional
+            Whether the exact solution can be prepared for W.
+
+        Returns
+        -------
+        choice : SolverChoice
+            The chosen solver and settings with the reason.
+        """
+        N = W.shape[0]
+        use_sparse = sp.sparse.issparse(W)
+        a = self._params.alpha
+        plan = self.data.plan
+        use_batch_solve = len(plan) > 1 and not plan.has_any_link_perturb()
+
+        if exsol_avail and not self._params.exsol_forbidden \
+                and (not use_sparse or N <= _AUTO_MAX_SPLU_NODES):
+            if use_sparse:
+                reason = "sparse LU for N=%d and nnz=%d" % (N, W.nnz)
+            else:
+                reason = "dense LU for N=%d" % (N)
+            solver = 'exact'
+        else:
+            # The factorization is not prepared for large networks
+            # or singular (I-aW).
+            radius = a*_estimate_spectral_radius(W)
+            if radius < _AUTO_MAX_RADIUS:
+                reason = "iterative method for N=%d, " \
+                         "where the spectral radius of aW <= %.3g" \
+                         % (N, radius)
+                solver = 'iterative'
+            else:
+                reason = "Krylov subspace method for N=%d, " \
+                         "where the spectral radius of aW " \
+                         "is not bounded by %.3g" % (N, _AUTO_MAX_RADIUS)
+                solver = 'krylov'
+                use_batch_solve = False
+
+        if use_batch_solve:
+            reason += " with the batched solve of %d conditions" % (len(plan))
+
+        return SolverChoice(solver, use_sparse, use_batch_solve, reason)
+    # end of def _choose_solver
+
+    def _get_W_single(self):
+        """Get the copy of W in single precision,
+           which is reused until W is assigned again.
+        """
+        if self._W_single_version != self._W_version:
+            self._W_single = self._W.astype(np.float32)
+            self._W_single_version = self._W_version
+        return self._W_single
+
     def initialize_network(self):
 
+        A = self.data.A
+        use_sparse = self._params.use_sparse
+        if self._params.solver == 'auto':
+            # Store W in CSR format if it is large and sparse enough.
+            N = A.shape[0]
+            nnz = A.nnz if sp.sparse.issparse(A) else np.count_nonzero(A)
+            use_sparse = N > _AUTO_MAX_DENSE_NODES \
+                         and nnz <= _AUTO_MAX_SPARSE_DENSITY*N*N
+
+        if use_sparse:
+            A = sp.sparse.csr_matrix(A).astype(np.float64)
+        elif sp.sparse.issparse(A):
+            A = A.toarray()
+
         # Matrix normalization for getting transition matrix
         if self._params.apply_weight_norm:
-            self.W = sfa.utils.normalize(self.data.A)
+            self.W = sfa.utils.normalize(A)
+        elif sp.sparse.issparse(A):
+            self.W = A
         else:
-            self.W = np.array(self.data.A, dtype=np.float)
+            self.W = np.array(A, dtype=np.float)
 
         self._check_dimension(self.W, "transition matrix")
 
-        if not self.params.exsol_forbidden:
+        if self._params.use_reduction:
+            # The reduced network is solved instead of the solver.
+            self.prepare_reduction()
+            return
+
+        if self._params.solver == 'auto':
+            self._solver_choice = self._choose_solver(self.W)
+
+        solver = self._get_setting('solver')
+        if solver == 'exact' and not self._params.exsol_forbidden:
             # Try to prepare the exact solution
             try:
-                self._prepare_exact_solution()
-                self._check_dimension(self._M, "exact solution matrix")
+                self.prepare_exact_solution()
                 self._exsol_avail = True
             except np.linalg.LinAlgError:
-                pass
+                self._exsol_avail = False
+                if self._params.solver == 'auto':
+                    # Choose the solver again without the factorization.
+                    choice = self._choose_solver(self.W, exsol_avail=False)
+                    self._solver_choice = choice
+                    solver = choice.solver
+
+        if solver == 'krylov':
+            self.prepare_krylov_solution()
+        elif solver == 'scc':
+            self.prepare_scc_solution()
 
         if not self._exsol_avail:
-            self._prepare_iterative_solution()
+            self.prepare_iterative_solution()
             self._exsol_avail = False
 
     # end of def _initialize_network
 
+    def _is_exsol_outdated(self):
+        """Check whether the prepared exact solution does not correspond
+           to the current W and alpha.
+        """
+        return self._exsol_key != (self._W_version, self._params.alpha)
+
+    def _is_krylov_outdated(self):
+        """Check whether the prepared preconditioner does not correspond
+           to the current W and alpha.
+        """
+        return self._krylov_key != (self._W_version, self._params.alpha)
+
+    def _is_scc_outdated(self):
+        """Check whether the prepared components do not correspond
+           to the current W and alpha.
+        """
+        return self._scc_key != (self._W_version, self._params.alpha)
+
     def _check_dimension(self, mat, mat_name):
         """Check whether a given matrix is a square matrix.
         """
@@ -216,53 +851,95 @@ class NetworkPropagation(sfa.base.Algorithm):
     # end of def
 
     def apply_inputs(self, inds, vals):
-        """
+        """Apply the input condition.
 
         Parameters
         ----------
-
+        inds : list
+            Indices of input nodes are appended to this list.
+        vals : list
+            Basal activities of input nodes are appended to this list.
         """
         if self._params.no_inputs:
             return
 
         # Input condition
-        if hasattr(self.data, 'inputs') and self.data.inputs:
-            inds_inputs = [self.data.n2i[inp] for inp in self.data.inputs]
-            vals_inputs = [val for val in self.data.inputs.values()]
-            inds.extend(inds_inputs)
-            vals.extend(vals_inputs)
-            # end of if
+        plan = self.data.plan
+        inds.extend(plan.inds_input.tolist())
+        vals.extend(plan.vals_input.tolist())
 
     # end of def apply_inputs
 
-    def apply_perturbations(self, targets, inds, vals, W_ptb=None):
-        if self.data.has_link_perturb and W_ptb is None:
+    def apply_perturbations(self, targets, inds, vals, W_ptb=None,
+                            scales=None):
+        """Apply the perturbations of targets.
+
+        Parameters
+        ----------
+        targets : list
+            List of node names, which are the keys of data.n2i.
+        inds : list
+            Indices of nodes to be perturbed are appended to this list.
+        vals : list
+            Basal activities of the perturbed nodes are appended to this list.
+        W_ptb : numpy.ndarray or scipy.sparse.csr_matrix, optional
+            Weight matrix that is modified in place
+            by link and isolation type perturbations.
+        scales : tuple of numpy.ndarray, optional
+            Row and column scales, (r, c), which are multiplied in place
+            by link and isolation type perturbations instead of modifying
+            W_ptb. The perturbed weight matrix is diag(r)*W*diag(c).
+        """
+        if self.data.has_link_perturb and W_ptb is None and scales is None:
             raise ValueError("Weight matrix for perturbation is necessary for "
                              "the data including link type perturbations.")
 
-        for target in targets:
-            if self.data.df_ptb is not None:
-                type_ptb = self.data.df_ptb.ix[target, "Type"]
-                val_ptb = self.data.df_ptb.ix[target, "Value"]
-            else:
-                type_ptb = 'node'
-                val_ptb = -1
-
-            if type_ptb == 'node':
-                inds.append(self.data.n2i[target])
-                vals.append(val_ptb)
-            elif type_ptb == 'link':
-                idx = self.data.n2i[target]
-                W_ptb[:, idx] *= val_ptb
-            elif type_ptb == 'isolation':
-                idx = self.data.n2i[target]
-                W_ptb[:, idx] *= val_ptb
-                W_ptb[idx, :] *= val_ptb
-            else:
-                raise ValueError("Undefined perturbation type: %s" % (type_ptb))
+        plan = sfa.base.PerturbationPlan(self.data, [targets])
+        inds.extend(plan.inds_node[0].tolist())
+        vals.extend(plan.vals_node[0].tolist())
+        self._perturb_weights(plan, 0, W_ptb, scales)
 
     # end of def apply_perturbations
 
+    def _get_basal_update(self, plan, i):
+        """Get the indices and basal activities of the nodes
+           updated by the inputs and the node type perturbations
+           of the i-th condition in the plan.
+           Only the inputs are applied, if i is None.
+        """
+        if self._params.no_inputs:
+            inds_input = plan.inds_input[:0]
+            vals_input = plan.vals_input[:0]
+        else:
+            inds_input = plan.inds_input
+            vals_input = plan.vals_input
+
+        if i is None:  # Control condition
+            return inds_input, vals_input
+
+        return (np.concatenate([inds_input, plan.inds_node[i]]),
+                np.concatenate([vals_input, plan.vals_node[i]]))
+
+    def _perturb_weights(self, plan, i, W_ptb=None, scales=None):
+        """Apply the link and isolation type perturbations
+           of the i-th condition in the plan to W_ptb or scales.
+        """
+        if not plan.has_link_perturb(i):
+            return
+
+        N = self.data.A.shape[0]
+        r = np.ones(N)
+        c = np.ones(N)
+        np.multiply.at(c, plan.inds_link[i], plan.vals_link[i])
+        np.multiply.at(r, plan.inds_iso[i], plan.vals_iso[i])
+        np.multiply.at(c, plan.inds_iso[i], plan.vals_iso[i])
+
+        if scales is not None:
+            scales[0][:] *= r
+            scales[1][:] *= c
+        elif W_ptb is not None:
+            _scale_matrix(W_ptb, r, c)
+
     def compute_batch(self):
 
         df_exp = self.data.df_exp  # Result of experiment
@@ -270,56 +947,449 @@ class NetworkPropagation(sfa.base.Algorithm):
         # Simulation result
         sim_result = np.zeros(df_exp.shape, dtype=np.float)
 
+        # Iteration numbers and residuals of the Krylov solver
+        use_krylov = (self._get_setting('solver') == 'krylov'
+                      and not self._params.use_reduction)
+        if use_krylov:
+            solver_info = np.full((df_exp.shape[0], 2), np.nan)
+
         b = self._b
 
-        if self._params.use_rel_change:
-            inds_ba = []  # Indices of nodes to be perturbed
-            vals_ba = []  # Basal activity
-            self.apply_inputs(inds_ba, vals_ba)
+        use_outputs = self._is_output_solve_used()
+
+        x_cnt = None
+        if self._params.use_rel_change and not use_outputs:
+            inds_ba, vals_ba = self._get_basal_update(self.data.plan, None)
             b[inds_ba] = vals_ba
             x_cnt = self.compute(b)
 
+        if use_outputs:
+            # Only the activities of the observed nodes are computed.
+            sim_result[:, :] = self._compute_outputs(b)
+        elif self._get_setting('use_batch_solve') \
+                and not self.data.plan.has_any_link_perturb():
+            # Solve all the conditions with a single multi-RHS computation
+            B = self._build_basal_matrix(b)
+            if self._params.warm_start != 'none' \
+                    and self._is_iterative_used():
+                X = self.compute(B, xi=self._compute_control(b, x_cnt))
+            else:
+                X = self.compute(B)
+            if use_krylov:
+                solver_info[:, 0], solver_info[:, 1] = self._krylov_info
+
+            if self._params.use_rel_change:
+                X = X - x_cnt[:, None]
+
+            sim_result[:, :] = X[self.data.iadj_to_idf, :].T
+        else:
+            def compute_conditions(alg, b, x_init, inds_conds=None):
+                iter_conds = alg._iter_conditions(b, x_init, inds_conds)
+                for i, x_exp in iter_conds:
+                    # Result of a single condition
+                    if self._params.use_rel_change:  # Use relative change
+                        x_diff = (x_exp - x_cnt)
+                        rel_change = x_diff
+                        res_single = rel_change[self.data.iadj_to_idf]
+                    else:
+                        res_single = x_exp[self.data.iadj_to_idf]
+
+                    sim_result[i, :] = res_single
+                    if use_krylov:
+                        solver_info[i, :] = alg._krylov_info
+                # end of for
+
+            n_threads = min(self._params.n_threads, df_exp.shape[0])
+            if n_threads > 1:
+                # Prepare the shared objects before copying this object.
+                self._prepare_solution()
+                x_init = x_cnt
+                if self._params.warm_start != 'none' \
+                        and self._is_iterative_used():
+                    x_init = self._compute_control(b, x_cnt)
+
+                def compute_chunk(inds_conds):
+                    # Each chunk uses the private b and W.
+                    alg = self.copy()
+                    # The dense LU factors are not safely shared
+                    # by the concurrent LAPACK solves.
+                    alg._copy_cached = True
+                    if isinstance(alg._M, tuple):
+                        alg._M = tuple(arr.copy() for arr in alg._M)
+                    if alg._scc_levels is not None:
+                        levels = []
+                        for inds, W_in, pos_single, d, blocks \
+                                in alg._scc_levels:
+                            blocks = [(pos, (lu.copy(), piv.copy()))
+                                      for pos, (lu, piv) in blocks]
+                            levels.append((inds, W_in, pos_single, d, blocks))
+                        alg._scc_levels = levels
+                    compute_conditions(alg, b.copy(), x_init, inds_conds)
+
+                chunks = np.array_split(np.arange(df_exp.shape[0]),
+                                        n_threads)
+                pool = ThreadPool(processes=n_threads)
+                try:
+                    pool.map(compute_chunk, chunks)
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                compute_conditions(self, b, x_cnt)
+
+        df_sim = pd.DataFrame(sim_result,
+                              index=df_exp.index,
+                              columns=df_exp.columns)
+
+        # Get the result of elements in the columns of df_exp.
+        self._result.df_sim = df_sim[df_exp.columns]
+
+        if use_krylov:
+            self._result.df_info = pd.DataFrame(solver_info,
+                                                index=df_exp.index,
+                                                columns=["num_iter",
+                                                         "residual"])
+        else:
+            self._result.df_info = None
+
+    # end of def compute_batch
+
+    def iter_batch(self, conditions, chunk_size=1000):
+        """Compute the conditions given by an iterable
+        and yield the results in chunks, so that the conditions
+        do not have to be known in advance nor fit in memory.
+
+        Parameters
+        ----------
+        conditions : iterable
+            Iterable of the lists of node names to be perturbed,
+            which are the keys of data.n2i, such as data.names_ptb.
+            The perturbations are defined by data.df_ptb
+            in the same way as compute_batch().
+        chunk_size : int, optional
+            Number of conditions yielded at once.
+
+        Yields
+        ------
+        labels : numpy.ndarray
+            1D array of the positions of the conditions in the iterable.
+        sim : numpy.ndarray
+            2D array of the activities of the observed nodes,
+            data.iadj_to_idf, (num. of conditions x num. of nodes).
+            The relative changes are yielded if use_rel_change is True.
+        """
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("chunk_size should be a positive integer.")
+
+        b = self._b.copy()
+        inds_obs = self.data.iadj_to_idf
+
+        x_cnt = None
+        if self._params.use_rel_change:
+            x_cnt = self._compute_control(b)
+
+        # Initial state of the iterative method
+        x_init = None
+        if self._params.warm_start != 'none' and self._is_iterative_used():
+            x_init = self._compute_control(b, x_cnt)
+
+        iter_conds = iter(conditions)
+        start = 0
+        while True:
+            names_ptb = list(itertools.islice(iter_conds, chunk_size))
+            if not names_ptb:
+                break
+
+            plan = sfa.base.PerturbationPlan(self.data, names_ptb)
+            has_link_perturb = any(plan.has_link_perturb(i)
+                                   for i in range(len(plan)))
+
+            if self._is_output_solve_used() and not has_link_perturb:
+                sim = self._compute_outputs(b, plan)
+            else:
+                if self._get_setting('use_batch_solve') \
+                        and not has_link_perturb:
+                    X = self.compute(self._build_basal_matrix(b, plan),
+                                     xi=x_init)
+                    sim = X[inds_obs, :].T
+                else:
+                    sim = np.empty((len(plan), len(inds_obs)))
+                    for i, x_exp in self._iter_conditions(b, x_init,
+                                                          plan=plan):
+                        sim[i, :] = x_exp[inds_obs]
+
+                if x_cnt is not None:
+                    sim -= x_cnt[inds_obs]
+
+            yield np.arange(start, start + len(plan)), sim
+            start += len(plan)
+        # end of while
+    # end of def iter_batch
+
+    def compute_combinations(self, targets, order=2, chunk_size=10000):
+        """Compute the activities of the observed nodes
+        for all combinations of node type perturbations.
+
+        The activity at steady-state is linear in b, so that
+        the response to a combination of targets is the sum of
+        the responses to the single targets and the control condition.
+        The single target responses are computed once,
+        and each combination is evaluated by the sum of their columns.
+
+        Parameters
+        ----------
+        targets : list
+            List of node names, which are the keys of data.n2i.
+            The perturbations of data.df_ptb are applied
+            if they are given, otherwise the activity is set to -1.
+        order : int, optional
+            Number of targets in a combination.
+        chunk_size : int, optional
+            Number of combinations yielded at once.
+
+        Yields
+        ------
+        combs : numpy.ndarray
+            2D array of the positions of targets in the combinations
+            (num. of combinations x order).
+        sim : numpy.ndarray
+            2D array of the activities of the observed nodes,
+            data.iadj_to_idf, (num. of combinations x num. of nodes).
+            The relative changes are yielded if use_rel_change is True.
+        """
+        if not isinstance(order, int) or not 0 < order <= len(targets):
+            raise ValueError("order should be an integer within [1, %d]."
+                             % (len(targets)))
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("chunk_size should be a positive integer.")
+
+        plan = sfa.base.PerturbationPlan(self.data,
+                                         [[target] for target in targets])
+        if any(plan.has_link_perturb(i) for i in range(len(plan))):
+            raise ValueError("Only node type perturbations can be combined.")
+
+        # Basal activity of the control condition
+        b = self._b.copy()
+        inds_ba, vals_ba = self._get_basal_update(plan, None)
+        b[inds_ba] = vals_ba
+
+        inds_ptb = np.concatenate(plan.inds_node)
+        vals_ptb = np.concatenate(plan.vals_node)
+        if np.unique(inds_ptb).size != inds_ptb.size:
+            raise ValueError("targets should be distinct nodes.")
+
+        # Responses of the observed nodes to the single targets
+        if self._is_output_solve_used():
+            if self._is_output_solution_outdated():
+                self.prepare_output_solution()
+            x_cnt = self._R_obs.dot(b)
+            D = self._R_obs[:, inds_ptb]*(vals_ptb - b[inds_ptb])
+        else:
+            B = np.empty((b.size, inds_ptb.size), dtype=np.float64)
+            B[:, :] = b[:, None]
+            B[inds_ptb, np.arange(inds_ptb.size)] = vals_ptb
+            X = self.compute(np.column_stack([b, B]))
+            X = X[self.data.iadj_to_idf, :]
+            x_cnt = X[:, 0]
+            D = X[:, 1:] - x_cnt[:, None]
+
+        if self._params.use_rel_change:
+            x_cnt = np.zeros_like(x_cnt)
+
+        D = np.ascontiguousarray(D.T)  # (num. of targets x num. of nodes)
+        iter_combs = itertools.combinations(range(inds_ptb.size), order)
+        while True:
+            combs = list(itertools.islice(iter_combs, chunk_size))
+            if not combs:
+                break
+
+            combs = np.array(combs, dtype=np.int64)
+            yield combs, x_cnt + D[combs].sum(axis=1)
+        # end of while
+    # end of def compute_combinations
+
+    def _compute_outputs(self, b, plan=None):
+        """Compute the activities of the observed nodes
+           for all conditions from the rows of M for them.
+
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activity shared by all conditions.
+        plan : sfa.base.PerturbationPlan, optional
+            Conditions to be computed. data.plan is used if it is not given.
+
+        Returns
+        -------
+        X : numpy.ndarray
+            2D array of the activities at steady-state
+            (num. of conditions x num. of observed nodes).
+        """
+        if self._is_output_solution_outdated():
+            self.prepare_output_solution()
+
+        R = self._R_obs
+        if plan is None:
+            plan = self.data.plan
+        x_base = R.dot(b)
+
+        def update(inds, vals):
+            # The last value is assigned for the duplicated indices.
+            inds, pos = np.unique(inds[::-1], return_index=True)
+            vals = vals[::-1][pos]
+            return x_base + R[:, inds].dot(vals - b[inds])
+
+        X = np.empty((len(plan), R.shape[0]), dtype=np.float64)
+        for i in range(len(plan)):
+            X[i, :] = update(*self._get_basal_update(plan, i))
+
+        if self._params.use_rel_change:
+            X -= update(*self._get_basal_update(plan, None))
+
+        return X
+    # end of def _compute_outputs
+
+    def _compute_control(self, b, x_cnt=None):
+        """Get the activity at steady-state of the control condition,
+           where only the inputs are applied to b.
+        """
+        if x_cnt is not None:
+            return x_cnt
+
+        inds_ba, vals_ba = self._get_basal_update(self.data.plan, None)
+        b_cnt = b.copy()
+        b_cnt[inds_ba] = vals_ba
+        return self.compute(b_cnt)
+
+    def _prepare_solution(self):
+        """Prepare the exact solution or the preconditioner
+           for the current W and alpha, if it is outdated.
+        """
+        if self._is_exsol_used() and self._is_exsol_outdated():
+            self.prepare_exact_solution()
+        elif self._get_setting('solver') == 'krylov' \
+                and self._is_krylov_outdated():
+            self.prepare_krylov_solution()
+        elif self._get_setting('solver') == 'scc' \
+                and self._is_scc_outdated():
+            self.prepare_scc_solution()
+        elif self._params.use_reduction and self._is_reduction_outdated():
+            self.prepare_reduction()
+
+    def _iter_conditions(self, b, x_cnt=None, inds_conds=None, plan=None):
+        """Compute the activity at steady-state for each condition.
+
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activity shared by all conditions.
+            It is restored after each condition.
+        x_cnt : numpy.ndarray, optional
+            The activity at steady-state of the control condition,
+            which is computed if it is necessary for the warm start.
+        inds_conds : list of int, optional
+            Indices of the conditions to be computed.
+            All conditions are computed if it is not given.
+        plan : sfa.base.PerturbationPlan, optional
+            Conditions to be computed. data.plan is used if it is not given.
+
+        Yields
+        ------
+        i : int
+            Index of the condition in the plan.
+        x : numpy.ndarray
+            1D array of the activity at steady-state.
+        """
         W_cnt = self.W
+        state_cnt = None  # W_cnt and the solutions prepared for it
+        N = b.size
+        use_lowrank = (self._params.use_lowrank_update
+                       and self._is_exsol_used()) \
+                      or self._params.use_reduction
 
-        # Main loop of the simulation
-        for i, targets_ptb in enumerate(self.data.names_ptb):
-            inds_ba = []  # Indices of nodes to be perturbed
-            vals_ba = []  # Basal activity
-            self.apply_inputs(inds_ba, vals_ba)  # Apply the input condition
+        if plan is None:
+            plan = self.data.plan
+        order = range(len(plan))
+        if inds_conds is not None:
+            order = list(inds_conds)
+
+        warm_start = self._params.warm_start
+        if not self._is_iterative_used():
+            warm_start = 'none'
+
+        xi = None
+        if warm_start != 'none':
+            xi = self._compute_control(b, x_cnt)
 
-            if self.data.has_link_perturb:
+        if warm_start == 'previous':
+            order = sorted(order, key=lambda i: plan.get_targets(i).tolist())
+
+        # Main loop of the simulation
+        for i in order:
+            # Indices and basal activities of the inputs and perturbed nodes
+            inds_ba, vals_ba = self._get_basal_update(plan, i)
+
+            scales = None
+            if use_lowrank and plan.has_link_perturb(i):
+                scales = (np.ones(N), np.ones(N))
+                self._perturb_weights(plan, i, scales=scales)
+            elif plan.has_link_perturb(i):
+                if self.W is W_cnt:
+                    state_cnt = self._save_prepared()
                 W_ptb = W_cnt.copy()
-                self.apply_perturbations(targets_ptb, inds_ba, vals_ba, W_ptb)
+                self._perturb_weights(plan, i, W_ptb)
                 self.W = W_ptb
-            else:
-                self.apply_perturbations(targets_ptb, inds_ba, vals_ba)
+                self._W_perturbed = True
+            elif self.W is not W_cnt:
+                self._restore_prepared(state_cnt)
 
             b_store = b[inds_ba]
             b[inds_ba] = vals_ba
-            x_exp = self.compute(b)
-
-            # Result of a single condition
-            if self._params.use_rel_change:  # Use relative change
-                x_diff = (x_exp - x_cnt)
-                rel_change = x_diff
-                res_single = rel_change[self.data.iadj_to_idf]
+            if scales is not None and self._params.use_reduction:
+                x_exp = self.propagate_reduced(b, *scales)
+            elif scales is not None:
+                x_exp = self.propagate_exact_lowrank(b, *scales)
             else:
-                res_single = x_exp[self.data.iadj_to_idf]
+                x_exp = self.compute(b, xi=xi)
+
+            if warm_start == 'previous':
+                xi = x_exp
 
-            sim_result[i, :] = res_single
             b[inds_ba] = b_store
+            yield i, x_exp
         # end of for
 
-        self.W = W_cnt
+        if self.W is not W_cnt:
+            self._restore_prepared(state_cnt)
+    # end of def _iter_conditions
 
-        df_sim = pd.DataFrame(sim_result,
-                              index=df_exp.index,
-                              columns=df_exp.columns)
+    def _build_basal_matrix(self, b, plan=None):
+        """Stack the basal activities of all conditions
+           into a 2D array, where each column represents a condition.
 
-        # Get the result of elements in the columns of df_exp.
-        self._result.df_sim = df_sim[df_exp.columns]
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activity shared by all conditions.
+        plan : sfa.base.PerturbationPlan, optional
+            Conditions to be stacked. data.plan is used if it is not given.
 
-    # end of def compute_batch
+        Returns
+        -------
+        B : numpy.ndarray
+            2D array of basal activities (num. of nodes x num. of conditions).
+        """
+        if plan is None:
+            plan = self.data.plan
+        B = np.empty((b.size, len(plan)), dtype=np.float64)
+        B[:, :] = b[:, None]
+        for i in range(len(plan)):
+            inds_ba, vals_ba = self._get_basal_update(plan, i)
+            B[inds_ba, i] = vals_ba
+        # end of for
+
+        return B
+    # end of def _build_basal_matrix
 
     def prepare_exact_solution(self):
         """Prepare to get the matrix for the exact solution.
@@ -331,14 +1401,114 @@ class NetworkPropagation(sfa.base.Algorithm):
         """
     # end of def _prepare_iterative_solution
 
-    def compute(self, b):
-        if self.params.exsol_forbidden is True \
-                or self._exsol_avail is False:
+    def prepare_krylov_solution(self):
+        """Prepare to get the solution from the Krylov subspace method.
+        """
+    # end of def prepare_krylov_solution
+
+    def prepare_scc_solution(self):
+        """Prepare to get the solution from the strongly connected
+           components of W in topological order.
+        """
+    # end of def prepare_scc_solution
+
+    def prepare_reduction(self):
+        """Prepare the reduced network onto the observed nodes,
+           the inputs and the perturbation targets in ``_reduced``.
+        """
+        raise NotImplementedError("prepare_reduction is not implemented")
+    # end of def prepare_reduction
+
+    def prepare_output_solution(self):
+        """Prepare the rows of M for the observed nodes,
+           data.iadj_to_idf, in ``_R_obs``.
+        """
+        raise NotImplementedError("prepare_output_solution "
+                                  "is not implemented")
+    # end of def prepare_output_solution
+
+    def _is_output_solution_outdated(self):
+        """Check whether the prepared rows of M do not correspond
+           to the current W, alpha and observed nodes.
+        """
+        key = (self._W_version, self._params.alpha,
+               tuple(self.data.iadj_to_idf))
+        return self._R_obs_key != key
+
+    def _is_output_solve_used(self):
+        """Check whether compute_batch() computes only
+           the activities of the observed nodes.
+        """
+        return self._params.restrict_outputs \
+               and self._is_exsol_used() \
+               and not self.data.plan.has_any_link_perturb()
+
+    def _is_exsol_used(self):
+        """Check whether compute() uses the exact solution.
+        """
+        return self._get_setting('solver') == 'exact' \
+               and not self._params.exsol_forbidden \
+               and not self._params.use_reduction \
+               and self._exsol_avail
+
+    def _is_iterative_used(self):
+        """Check whether compute() uses the iterative method.
+        """
+        return self._get_setting('solver') not in ('krylov', 'scc') \
+               and not self._params.use_reduction \
+               and not self._is_exsol_used()
+
+    def compute(self, b, xi=None):
+        """Compute the activity at steady-state.
+
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activity, or 2D array whose columns
+            are the basal activities of multiple conditions.
+        xi : numpy.ndarray, optional
+            Initial state of the iterative method.
+            The basal activity is the initial state if it is not given.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            The activity at steady-state, which has the same shape as b.
+        """
+        if self._params.use_reduction:
+            return self.propagate_reduced(b)
+        elif self._get_setting('solver') == 'krylov':
+            return self.propagate_krylov(b)
+        elif self._get_setting('solver') == 'scc':
+            return self.propagate_scc(b)
+        elif self._is_iterative_used():
             alpha = self._params.alpha
             W = self.W
             lim_iter = self._params.lim_iter
-            x_ss, _ = self.propagate_iterative(W, b, b, a=alpha,
-                                               lim_iter=lim_iter)
+            depth = self._params.anderson_depth
+            if self._params.precision == 'single':
+                W = self._get_W_single()
+
+            if xi is None:
+                xi = b
+
+            x_ss, _ = self.propagate_iterative(W, xi, b, a=alpha,
+                                               lim_iter=lim_iter,
+                                               anderson_depth=depth)
+
+            if self._params.precision == 'single':
+                x_ss = np.asarray(x_ss, dtype=np.float64)
+                y = (1-alpha)*np.asarray(b, dtype=np.float64)
+                for i in range(self._params.num_refinements):
+                    # Residual of (I-aW)*x = (1-a)b in double precision
+                    r = y - (x_ss - alpha*self.W.dot(x_ss))
+                    # Correction d of (I-aW)*d = r in single precision
+                    d, _ = self.propagate_iterative(W, np.zeros_like(r),
+                                                    r/(1-alpha), a=alpha,
+                                                    lim_iter=lim_iter,
+                                                    anderson_depth=depth)
+                    x_ss += d
+                # end of for
             return x_ss  # x at steady-state (i.e., stationary state)
         else:
             return self.propagate_exact(b)
@@ -349,10 +1519,33 @@ class NetworkPropagation(sfa.base.Algorithm):
         """Obtain the activity at steady-state
         based on the exact solution of network propagation.
 
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activity, or 2D array whose columns
+            are the basal activities of multiple conditions.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            The exact solution of the activity at steady-state,
+            which has the same shape as b.
+        """
+        raise NotImplementedError("propagate_exact is not implemented")
+
+    def propagate_exact_lowrank(self, b, r, c):
+        """Obtain the activity at steady-state
+        based on the exact solution for the perturbed weight matrix,
+        diag(r)*W*diag(c), by updating the solution of W.
+
         Parameters
         ----------
         b : numpy.ndarray
             1D array of basal activity.
+        r : numpy.ndarray
+            1D array of row scales of W.
+        c : numpy.ndarray
+            1D array of column scales of W.
 
         Returns
         -------
@@ -360,7 +1553,67 @@ class NetworkPropagation(sfa.base.Algorithm):
             The exact solution of the activity at steady-state
             in 1D array.
         """
-        raise NotImplementedError("propagate_exact is not implemented")
+        raise NotImplementedError("propagate_exact_lowrank "
+                                  "is not implemented")
+
+    def propagate_krylov(self, b):
+        """Obtain the activity at steady-state
+        based on a Krylov subspace method.
+        The number of iterations and the relative residual
+        of the last call are stored in ``_krylov_info``.
+
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activity, or 2D array whose columns
+            are the basal activities of multiple conditions.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            The activity at steady-state, which has the same shape as b.
+        """
+        raise NotImplementedError("propagate_krylov is not implemented")
+
+    def propagate_scc(self, b):
+        """Obtain the activity at steady-state by solving
+        the strongly connected components of W in topological order.
+
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activity, or 2D array whose columns
+            are the basal activities of multiple conditions.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            The activity at steady-state, which has the same shape as b.
+        """
+        raise NotImplementedError("propagate_scc is not implemented")
+
+    def propagate_reduced(self, b, r=None, c=None):
+        """Obtain the activities at steady-state of the kept nodes
+        from the reduced network, where the weight matrix
+        can be perturbed into diag(r)*W*diag(c) at the kept nodes.
+
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activity, or 2D array whose columns
+            are the basal activities of multiple conditions.
+        r : numpy.ndarray, optional
+            1D array of row scales of W.
+        c : numpy.ndarray, optional
+            1D array of column scales of W.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            The activity at steady-state, which has the same shape as b.
+            The activities of the eliminated nodes are NaN.
+        """
+        raise NotImplementedError("propagate_reduced is not implemented")
 
     def propagate_iterative(self,
                             W,
@@ -369,7 +1622,8 @@ class NetworkPropagation(sfa.base.Algorithm):
                             a=0.5,
                             lim_iter=1000,
                             tol=1e-5,
-                            get_trj=False):
+                            get_trj=False,
+                            anderson_depth=0):
 
         r"""Compute network propagation based on the iterative method.
         This method should be used if we want to obtain the trajectory.
@@ -382,6 +1636,12 @@ class NetworkPropagation(sfa.base.Algorithm):
             1D array for initial state.
         b: numpy.ndarray
             1D array for basal activity.
+            The states are computed in single precision,
+            if W is a single precision matrix.
+            If b is a 2D array whose columns are the basal activities
+            of multiple conditions, all the conditions are propagated
+            together, and xi should be a 1D array or a 2D array
+            of the same shape as b.
         a: real number, optional
             Hyperparameter, :math:`\alpha`, ~ (0, 1).
             The default value is 0.5.
@@ -393,16 +1653,33 @@ class NetworkPropagation(sfa.base.Algorithm):
             Tolerance for terminating iteration.
             Iteration continues, if Frobenius norm of
             :math:`x(t+1)-x(t)` is greater than ``tol``.
+            For multiple conditions, the norm is checked for each column,
+            and the converged columns are no longer updated.
             The default value is 1e-5.
-        get_trj: bool, optional
+        get_trj: bool or TrajectoryRecorder, optional
             Determine whether the trajectory of the state is returned.
             If get_trj is true, the trajectory is returned.
+            If a TrajectoryRecorder object is given, the trajectory
+            is recorded by the object (e.g., every k-th step of
+            a subset of nodes in a memory-mapped array).
+            It is not supported for multiple conditions.
+        anderson_depth: int, optional
+            Number of previous iterates used by Anderson mixing
+            to accelerate the convergence. The iteration terminates
+            under the same condition, and the unaccelerated update of
+            the last state is returned.
+            The default value is 0, which means no acceleration.
 
         Returns
         -------
         x : numpy.ndarray
             1D array of the activity after the computation.
-        trj : numpy.ndarray
+            2D array for multiple conditions.
+        num_iter : int or numpy.ndarray, optional
+            The number of iterations, which is returned
+            if get_trj is false. 1D array of the numbers for each condition
+            is returned for multiple conditions.
+        trj : numpy.ndarray, optional
             2D array where the row represents a state of the activity.
 
         See also
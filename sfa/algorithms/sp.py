@@ -4,10 +4,25 @@ import sys
 if sys.version_info <= (2, 8):
     from builtins import super
 
+import warnings
+
 import numpy as np
+import scipy as sp
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.csgraph
+import scipy.sparse.linalg
 
 from .np import NetworkPropagation
 from .np import NetworkPropagationParameterSet
+from .np import TrajectoryRecorder
+from .cache import get_factorization_cache
+from .cache import hash_matrix
+
+
+# Maximum size of the frontier in the topological sort of the SCCs,
+# which is processed without the vectorized operations.
+_SCC_MAX_SMALL_FRONTIER = 16
 
 
 def create_algorithm(abbr):
@@ -44,25 +59,527 @@ class SignalPropagation(NetworkPropagation):
               s = (I-aW)^-1 * (1-a)b
               s = M*b, where M is (1-a)(I-aW)^-1.
 
-        This method is to get the matrix, M for preparing the exact solution
+        This method is to get the LU factorization of (I-aW),
+        instead of forming M explicitly. The factorization is reused
+        until W or alpha is changed.
+        The sparse LU factorization is used for W in CSR format.
+        The factorization is computed in single precision,
+        if the precision parameter is 'single'.
+        The factorization of the same W and alpha is shared
+        through the process-wide cache, if use_cache is True.
+        Only the factorization of the control W is cached,
+        not those of the W perturbed for each condition.
         """
         W = self._W
         a = self._params.alpha
-        M0 = np.eye(W.shape[0]) - a*W
-        self._M = (1-a)*np.linalg.inv(M0)
+        dtype = self._get_dtype()
+        use_cache = self._params.use_cache and not self._W_perturbed
+
+        if use_cache:
+            cache = get_factorization_cache()
+            key = self._get_cache_key('lu')
+            M = cache.get(key)
+            if M is not None:
+                if self._copy_cached and isinstance(M, tuple):
+                    M = tuple(arr.copy() for arr in M)
+                self._M = M
+                self._exsol_key = (self._W_version, a)
+                return
+
+        if sp.sparse.issparse(W):
+            M0 = sp.sparse.identity(W.shape[0], dtype=dtype, format='csc') \
+                 - dtype(a)*W.astype(dtype)
+            try:
+                self._M = sp.sparse.linalg.splu(M0.tocsc())
+            except RuntimeError as err:  # Exactly singular
+                raise np.linalg.LinAlgError(str(err))
+
+            # Size of the sparse factors and permutations
+            nbytes = (self._M.L.nnz + self._M.U.nnz) \
+                     * (np.dtype(dtype).itemsize + 4) \
+                     + 2*self._M.perm_r.nbytes
+        else:
+            M0 = np.eye(W.shape[0], dtype=dtype) - dtype(a)*W.astype(dtype)
+            with warnings.catch_warnings():
+                # Singularity is reported as LinAlgError below.
+                warnings.simplefilter("ignore")
+                lu, piv = sp.linalg.lu_factor(M0)
+
+            if np.any(np.diag(lu) == 0):
+                raise np.linalg.LinAlgError("Singular matrix")
+
+            self._M = (lu, piv)
+            nbytes = lu.nbytes + piv.nbytes
+
+        self._exsol_key = (self._W_version, a)
+        if use_cache:
+            cache.put(key, self._M, nbytes)
     # end of def _prepare_exact_solution
 
     def prepare_iterative_solution(self):
         pass  # Nothing...
     # end of def prepare_iterative_solution
 
+    def prepare_krylov_solution(self):
+        """
+        Prepare the incomplete LU factorization of (I-aW),
+        which preconditions the Krylov subspace method.
+        The preconditioner is reused until W or alpha is changed.
+        """
+        W = self._W
+        a = self._params.alpha
+        N = W.shape[0]
+        M0 = sp.sparse.identity(N, format='csc') - a*sp.sparse.csc_matrix(W)
+        M0 = M0.tocsc()
+        try:
+            ilu = sp.sparse.linalg.spilu(M0)
+            precond = sp.sparse.linalg.LinearOperator((N, N),
+                                                      matvec=ilu.solve)
+        except RuntimeError:  # Singular factor: no preconditioning
+            precond = None
+
+        self._krylov_op = M0
+        self._krylov_precond = precond
+        self._krylov_key = (self._W_version, a)
+    # end of def prepare_krylov_solution
+
+    def _get_dtype(self):
+        if self._params.precision == 'single':
+            return np.float32
+        return np.float64
+
+    def _solve_exact(self, y, trans=False):
+        """Solve (I-aW)*s = y, or (I-aW)^T*s = y if trans is True,
+        using the prepared factorization.
+        The solution in single precision is improved by
+        the iterative refinement in double precision.
+        """
+        if self._is_exsol_outdated():
+            self.prepare_exact_solution()
+
+        s = self._solve_factorized(y, trans)
+        if self._params.precision == 'single':
+            W = self._W.T if trans else self._W
+            a = self._params.alpha
+            y = np.asarray(y, dtype=np.float64)
+            for i in range(self._params.num_refinements):
+                r = y - (s - a*W.dot(s))  # Residual in double precision
+                s += self._solve_factorized(r, trans)
+
+        return s
+
+    def _solve_factorized(self, y, trans=False):
+        y = np.asarray(y, dtype=self._get_dtype())
+        if sp.sparse.issparse(self._W):
+            s = self._M.solve(y, trans='T' if trans else 'N')
+        else:
+            s = sp.linalg.lu_solve(self._M, y, trans=int(trans))
+
+        return s.astype(np.float64)
+
+    def prepare_output_solution(self):
+        """
+        Prepare the rows of M = (1-a)(I-aW)^-1 for the observed nodes.
+        The i-th row of (I-aW)^-1 is the solution of
+        (I-aW)^T*z = e_i, so that k transposed solves with
+        the factorization of (I-aW) are required for k observed nodes,
+        instead of forming M explicitly.
+        """
+        a = self._params.alpha
+        inds_obs = np.asarray(self.data.iadj_to_idf, dtype=np.int64)
+        E = np.zeros((self._W.shape[0], inds_obs.size))
+        E[inds_obs, np.arange(inds_obs.size)] = 1
+
+        self._R_obs = (1-a)*self._solve_exact(E, trans=True).T
+        self._R_obs_key = (self._W_version, a, tuple(self.data.iadj_to_idf))
+    # end of def prepare_output_solution
+
     def propagate_exact(self, b):
-        if self._weight_matrix_invalidated:
-            self._prepare_exact_solution()
-            
-        return self._M.dot(b)
+        a = self._params.alpha
+        return (1-a)*self._solve_exact(b)
     # end of def propagate_exact
 
+    def propagate_exact_lowrank(self, b, r, c):
+        """
+        The perturbed weight matrix is W' = diag(r)*W*diag(c),
+        and its difference from W is confined to the rows and columns
+        of the perturbed nodes. Thus, (I-aW') = (I-aW) - U*V^T,
+        where U and V have k columns for k perturbed rows and columns.
+
+        Based on Sherman-Morrison-Woodbury formula,
+
+            s' = s + Z*(I - V^T*Z)^-1 * V^T*s,
+
+        where s = (I-aW)^-1 * (1-a)b and Z = (I-aW)^-1 * U.
+        Only k solves with the factorization of (I-aW) are required.
+        """
+        W = self._W
+        a = self._params.alpha
+
+        ic = np.flatnonzero(c != 1)  # Scaled columns
+        ir = np.flatnonzero(r != 1)  # Scaled rows
+        if ic.size == 0 and ir.size == 0:
+            return self.propagate_exact(b)
+
+        N = W.shape[0]
+        W_c = W[:, ic]
+        W_r = W[ir, :]
+        if sp.sparse.issparse(W):
+            W_c = W_c.toarray()
+            W_r = W_r.toarray()
+
+        # Differences in the scaled columns
+        D_c = (r[:, None]*W_c)*c[ic] - W_c
+
+        # Differences in the scaled rows except the scaled columns
+        D_r = (r[ir, None] - 1)*W_r
+        D_r[:, ic] = 0
+
+        # (I-aW') = (I-aW) - U*V^T
+        U = np.zeros((N, ic.size + ir.size))
+        U[:, :ic.size] = a*D_c
+        U[ir, ic.size + np.arange(ir.size)] = a
+
+        def dot_VT(X):  # V^T*X
+            return np.concatenate([X[ic], D_r.dot(X)])
+
+        s = self.propagate_exact(b)
+        Z = self._solve_exact(U)
+        K = np.eye(U.shape[1]) - dot_VT(Z)
+        return s + Z.dot(np.linalg.solve(K, dot_VT(s)))
+    # end of def propagate_exact_lowrank
+
+    def propagate_krylov(self, b):
+        if self._is_krylov_outdated():
+            self.prepare_krylov_solution()
+
+        a = self._params.alpha
+        if self._params.krylov_method == 'gmres':
+            method = sp.sparse.linalg.gmres
+        else:
+            method = sp.sparse.linalg.bicgstab
+
+        B = (1-a)*np.asarray(b, dtype=np.float64)
+        if B.ndim == 1:
+            x, num_iter, residual = self._solve_krylov(method, B)
+            self._krylov_info = (num_iter, residual)
+            return x
+
+        X = np.zeros_like(B)
+        num_iter = np.zeros(B.shape[1], dtype=np.int64)
+        residual = np.zeros(B.shape[1])
+        for i in range(B.shape[1]):
+            X[:, i], num_iter[i], residual[i] = \
+                self._solve_krylov(method, B[:, i])
+
+        self._krylov_info = (num_iter, residual)
+        return X
+    # end of def propagate_krylov
+
+    def _solve_krylov(self, method, y):
+        """Solve (I-aW)*x = y, and return x with the number of iterations
+        and the relative residual.
+        """
+        A = self._krylov_op
+        counter = [0]
+
+        def count(_):
+            counter[0] += 1
+
+        kwargs = dict(M=self._krylov_precond,
+                      maxiter=self._params.lim_iter,
+                      callback=count)
+        if method is sp.sparse.linalg.gmres:
+            kwargs['callback_type'] = 'pr_norm'
+
+        try:
+            x, _ = method(A, y, rtol=1e-10, atol=0.0, **kwargs)
+        except TypeError:  # SciPy < 1.12
+            x, _ = method(A, y, tol=1e-10, atol=0.0, **kwargs)
+
+        norm_y = np.linalg.norm(y)
+        residual = np.linalg.norm(y - A.dot(x))
+        if norm_y > 0:
+            residual /= norm_y
+
+        return x, counter[0], residual
+    # end of def _solve_krylov
+
+    def prepare_scc_solution(self):
+        """
+        Prepare the strongly connected components (SCCs) of W
+        for solving (I-aW)*s = (1-a)b block by block.
+
+        The activity of a node depends on the nodes of the links
+        coming into it, so that the SCCs are solved
+        in topological order of the condensed graph:
+
+            (I-aW_CC)*s_C = (1-a)b_C + a*W_CP*s_P,
+
+        where C is a component and P is the set of its predecessors,
+        which are already solved. The components in the same level of
+        the topological order are solved together. A component of
+        a single node is solved by a division, and the other components
+        are solved by their own LU factorizations.
+        """
+        W = sp.sparse.csr_matrix(self._W, dtype=np.float64)
+        a = self._params.alpha
+
+        num_comps, labels = sp.sparse.csgraph.connected_components(
+                                W, directed=True, connection='strong')
+
+        # Links between the components, W_ij for j -> i
+        W_coo = W.tocoo()
+        is_outer = (labels[W_coo.row] != labels[W_coo.col])
+        ir = W_coo.row[is_outer]
+        ic = W_coo.col[is_outer]
+        W_outer = sp.sparse.csr_matrix((W_coo.data[is_outer], (ir, ic)),
+                                       shape=W.shape)
+
+        # Levels of the components in topological order
+        C = sp.sparse.csr_matrix((np.ones(ir.size), (labels[ic], labels[ir])),
+                                 shape=(num_comps, num_comps))
+        C.data[:] = 1  # Successors of each component
+        in_degree = np.asarray(C.sum(axis=0)).ravel().astype(np.int64)
+        levels = np.full(num_comps, -1)
+        frontier = np.flatnonzero(in_degree == 0)
+        level = 0
+        indptr = indices = None  # Lists of C for small frontiers
+        while frontier.size > 0:
+            levels[frontier] = level
+            if frontier.size <= _SCC_MAX_SMALL_FRONTIER:
+                # Small frontiers (e.g., of a chain) are faster
+                # without the overhead of the vectorized operations.
+                if indptr is None:
+                    indptr = C.indptr.tolist()
+                    indices = C.indices.tolist()
+
+                next_frontier = []
+                for i in frontier.tolist():
+                    for j in indices[indptr[i]:indptr[i+1]]:
+                        in_degree[j] -= 1
+                        if in_degree[j] == 0:
+                            next_frontier.append(j)
+                frontier = np.array(next_frontier, dtype=np.int64)
+            else:
+                # Successors of the frontier from the CSR arrays of C
+                starts = C.indptr[frontier]
+                counts = C.indptr[frontier + 1] - starts
+                offsets = np.repeat(starts - np.cumsum(counts) + counts,
+                                    counts)
+                succ = C.indices[offsets + np.arange(offsets.size)]
+                np.subtract.at(in_degree, succ, 1)
+                frontier = np.unique(succ[in_degree[succ] == 0])
+            level += 1
+        # end of while
+
+        sizes = np.bincount(labels, minlength=num_comps)
+        diag = W.diagonal()
+        num_levels = levels.max() + 1
+
+        # Group the nodes by the levels and the components,
+        # so that each level and each component is a slice of them.
+        node_order = np.lexsort((labels, levels[labels]))
+        node_ptr = np.zeros(num_levels + 1, dtype=np.int64)
+        node_ptr[1:] = np.cumsum(np.bincount(levels[labels],
+                                             minlength=num_levels))
+        comp_order = np.argsort(levels, kind='stable')
+        comp_start = np.zeros(num_comps, dtype=np.int64)
+        comp_start[comp_order] = np.cumsum(sizes[comp_order]) \
+                                 - sizes[comp_order]
+
+        # Components of multiple nodes are solved by their LU factors.
+        blocks = [[] for _ in range(num_levels)]
+        for comp in np.flatnonzero(sizes > 1):
+            level = levels[comp]
+            start = comp_start[comp]
+            inds = node_order[start:start + sizes[comp]]
+            M0 = np.eye(inds.size) - a*W[inds][:, inds].toarray()
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                lu, piv = sp.linalg.lu_factor(M0)
+
+            if np.any(np.diag(lu) == 0):
+                raise np.linalg.LinAlgError("Singular matrix")
+
+            # Positions of the nodes in those of the level
+            pos = np.arange(start, start + sizes[comp]) - node_ptr[level]
+            blocks[level].append((pos, (lu, piv)))
+        # end of for
+
+        # Components of a single node are solved by a division.
+        is_single = (sizes[labels[node_order]] == 1)
+        d = 1 - a*diag[node_order]
+        if np.any(d[is_single] == 0):
+            raise np.linalg.LinAlgError("Singular matrix")
+
+        # Rows of W_outer in the order of the nodes
+        W_outer = W_outer[node_order]
+
+        self._scc_levels = []
+        for level in range(num_levels):
+            i0, i1 = node_ptr[level], node_ptr[level+1]
+            single = is_single[i0:i1]
+
+            # Rows of the level in W_outer as the slices of its arrays
+            k0, k1 = W_outer.indptr[i0], W_outer.indptr[i1]
+            W_in = (W_outer.indptr[i0:i1+1] - k0,
+                    W_outer.indices[k0:k1],
+                    W_outer.data[k0:k1])
+
+            self._scc_levels.append((node_order[i0:i1], W_in,
+                                     np.flatnonzero(single),
+                                     d[i0:i1][single], blocks[level]))
+        # end of for
+
+        self._scc_key = (self._W_version, a)
+    # end of def prepare_scc_solution
+
+    def propagate_scc(self, b):
+        if self._is_scc_outdated():
+            self.prepare_scc_solution()
+
+        a = self._params.alpha
+        b = np.asarray(b, dtype=np.float64)
+        x = np.zeros_like(b)
+        for inds, W_in, pos_single, d, blocks in self._scc_levels:
+            y = (1-a)*b[inds] + a*_dot_csr_rows(W_in, x)
+            if b.ndim == 2:
+                d = d[:, None]
+
+            y[pos_single] /= d
+            for pos, lu_piv in blocks:
+                y[pos] = sp.linalg.lu_solve(lu_piv, y[pos])
+            x[inds] = y
+        # end of for
+
+        return x
+    # end of def propagate_scc
+
+    def prepare_reduction(self):
+        """
+        Prepare the reduced network onto the observed nodes,
+        the inputs and the perturbation targets, which are the only nodes
+        whose basal activities or links are changed by the conditions.
+        The reduced network of the same W, alpha, kept nodes and
+        basal activities of the eliminated nodes is shared
+        through the process-wide cache, if use_cache is True.
+        """
+        a = self._params.alpha
+        inds = self._get_reduction_nodes()
+        b = self._b if self._b is not None else np.zeros(self._W.shape[0])
+
+        if self._params.use_cache:
+            cache = get_factorization_cache()
+            key = self._get_cache_key('reduction') \
+                  + (hash_matrix(inds), hash_matrix(b))
+            reduced = cache.get(key)
+
+        if not self._params.use_cache or reduced is None:
+            reduced = ReducedNetwork.from_weight_matrix(self._W, a, inds, b)
+            reduced.W_hash = self._get_W_hash()
+            if self._params.use_cache:
+                cache.put(key, reduced, reduced.nbytes)
+
+        self._reduced = reduced
+        self._reduction_key = self._get_reduction_key()
+    # end of def prepare_reduction
+
+    def propagate_reduced(self, b, r=None, c=None):
+        if self._is_reduction_outdated():
+            self.prepare_reduction()
+
+        reduced = self._reduced
+        inds = reduced.inds
+        b = np.asarray(b, dtype=np.float64)
+        b_elim = np.delete(b, inds, axis=0)
+        if b.ndim == 2:
+            b_elim = b_elim.T
+
+        if not np.all(b_elim == reduced.b_elim):
+            raise ValueError("The basal activities of the eliminated nodes "
+                             "are different from those of the reduced "
+                             "network.")
+
+        if r is not None:
+            if np.any(np.delete(r, inds) != 1) \
+                    or np.any(np.delete(c, inds) != 1):
+                raise ValueError("The links of the eliminated nodes "
+                                 "cannot be perturbed.")
+            r = r[inds]
+            c = c[inds]
+
+        x = np.full(b.shape, np.nan)
+        x[inds] = reduced.solve(b[inds], r, c)
+        return x
+    # end of def propagate_reduced
+
+    def compute_alpha_sweep(self, alphas):
+        """Compute the batch of the assigned data for multiple alphas.
+
+        For the Schur decomposition, W = Z*T*Z^H,
+        where Z is unitary and T is upper triangular,
+
+            (1-a)(I-aW)^-1 * b = (1-a)Z * (I-aT)^-1 * Z^H*b.
+
+        Hence, a single decomposition of W gives the solutions
+        for any alpha with triangular solves.
+        Only the data without link or isolation type perturbations
+        are supported.
+
+        Parameters
+        ----------
+        alphas : list (or iterable) of float
+            Values of alpha in (0, 1).
+
+        Returns
+        -------
+        sim : numpy.ndarray
+            3D array of simulation results, whose shape is
+            (num. of alphas, num. of conditions, num. of outputs).
+            sim[i] corresponds to ``result.df_sim`` of alphas[i],
+            where the rows and columns are arranged as
+            ``data.df_exp.index`` and ``data.df_exp.columns``.
+        """
+        if self.data.plan.has_any_link_perturb():
+            raise ValueError("compute_alpha_sweep does not support "
+                             "the data including link or isolation type "
+                             "perturbations.")
+
+        alphas = np.asarray(alphas, dtype=np.float64)
+        if np.any(alphas <= 0.0) or np.any(alphas >= 1.0):
+            raise ValueError("alpha should be within (0,1).")
+
+        W = self._W
+        if sp.sparse.issparse(W):
+            W = W.toarray()
+
+        T, Z = sp.linalg.schur(W, output='complex')
+        Z_obs = Z[self.data.iadj_to_idf, :]
+        I = np.eye(T.shape[0])
+
+        b = self._b.copy()
+        B = self._build_basal_matrix(b)
+        Y = Z.conj().T.dot(B)
+        if self._params.use_rel_change:
+            inds_ba, vals_ba = self._get_basal_update(self.data.plan, None)
+            b[inds_ba] = vals_ba
+            y_cnt = Z.conj().T.dot(b)
+
+        sim = np.zeros((alphas.size, B.shape[1], Z_obs.shape[0]))
+        for i, a in enumerate(alphas):
+            U = sp.linalg.solve_triangular(I - a*T, Y)
+            X_obs = (1-a)*Z_obs.dot(U).real
+            if self._params.use_rel_change:
+                u_cnt = sp.linalg.solve_triangular(I - a*T, y_cnt)
+                X_obs -= (1-a)*Z_obs.dot(u_cnt).real[:, None]
+
+            sim[i] = X_obs.T
+        # end of for
+
+        return sim
+    # end of def compute_alpha_sweep
+
     def propagate_iterative(self,
                             W,
                             xi,
@@ -70,22 +587,41 @@ class SignalPropagation(NetworkPropagation):
                             a=0.5,
                             lim_iter=1000,
                             tol=1e-5,
-                            get_trj=False):
+                            get_trj=False,
+                            anderson_depth=0):
 
+        if np.ndim(b) == 2:
+            if get_trj:
+                raise ValueError("get_trj is not supported "
+                                 "for multiple conditions.")
+            return self._propagate_iterative_multiple(W, xi, b, a,
+                                                      lim_iter, tol,
+                                                      anderson_depth)
 
         n = W.shape[0]
         # Initial values
 
         #x0 = np.zeros((n,), dtype=np.float)
         #x0[:] = xi
-        x0 = np.array(xi, dtype=np.float64)
+        dtype = np.float32 if W.dtype == np.float32 else np.float64
+        x0 = np.array(xi, dtype=dtype)
+        b = np.asarray(b, dtype=dtype)
+        a = dtype(a)
 
         x_t1 = x0.copy()
 
-        if get_trj:
+        if anderson_depth > 0:
+            mixer = _AndersonMixer(anderson_depth)
+
+        recorder = None
+        if isinstance(get_trj, TrajectoryRecorder):
+            recorder = get_trj
+        elif get_trj:
+            recorder = TrajectoryRecorder(n, lim_iter)
+
+        if recorder is not None:
             # Record the initial states
-            trj_x = []
-            trj_x.append(x_t1.copy())
+            recorder.record(0, x_t1)
 
         # Main loop
         num_iter = 0
@@ -97,18 +633,286 @@ class SignalPropagation(NetworkPropagation):
             if np.linalg.norm(x_t2 - x_t1) <= tol:
                 break
 
+            if anderson_depth > 0:
+                x_t2 = mixer.mix(x_t1[:, None], x_t2[:, None])[:, 0]
+
             # Add the current state to the trajectory
-            if get_trj:
-                trj_x.append(x_t2)
+            if recorder is not None:
+                recorder.record(num_iter, x_t2)
 
             # Update the state
-            x_t1 = x_t2.copy()
+            x_t1 = x_t2
         # end of for
 
-        if get_trj is False:
+        if recorder is None:
             return x_t2, num_iter
         else:
-            return x_t2, np.array(trj_x)
+            return x_t2, recorder.trj
 
     # end of def propagate_iterative
+
+    def _propagate_iterative_multiple(self, W, xi, b, a, lim_iter, tol,
+                                      anderson_depth=0):
+        """Propagate the columns of b (multiple conditions) together.
+        Only the columns that have not converged are updated.
+        """
+        num_conds = b.shape[1]
+        dtype = np.float32 if W.dtype == np.float32 else np.float64
+        a = dtype(a)
+        X = np.empty(b.shape, dtype=dtype)
+        X[:, :] = np.reshape(xi, (xi.shape[0], -1))  # Broadcast 1D xi
+        B = (1-a)*np.asarray(b, dtype=dtype)
+
+        num_iter = np.zeros(num_conds, dtype=np.int64)
+        active = np.arange(num_conds)  # Columns to be updated
+        if anderson_depth > 0:
+            mixer = _AndersonMixer(anderson_depth)
+
+        for i in range(lim_iter):
+            X_t1 = X[:, active]
+            X_t2 = a*W.dot(X_t1) + B[:, active]
+            num_iter[active] += 1
+
+            # Check termination condition of each column
+            converged = np.linalg.norm(X_t2 - X_t1, axis=0) <= tol
+            if anderson_depth > 0:
+                X_mixed = mixer.mix(X_t1, X_t2, active)
+                X_t2[:, ~converged] = X_mixed[:, ~converged]
+
+            X[:, active] = X_t2
+            active = active[~converged]
+            if active.size == 0:
+                break
+        # end of for
+
+        return X, num_iter
+    # end of def _propagate_iterative_multiple
 # end of def class SignalPropagation
+
+
+def _dot_csr_rows(W_in, x):
+    """Multiply the rows of a CSR matrix, which are given as
+       the tuple of (indptr, indices, data), by x of 1D or 2D.
+    """
+    indptr, indices, data = W_in
+    y = np.zeros((indptr.size - 1,) + x.shape[1:], dtype=x.dtype)
+    if data.size == 0:
+        return y
+
+    prod = x[indices] * (data[:, None] if x.ndim == 2 else data)
+    nonempty = indptr[:-1] < indptr[1:]
+    y[nonempty] = np.add.reduceat(prod, indptr[:-1][nonempty], axis=0)
+    return y
+
+
+class _AndersonMixer(object):
+    """Anderson mixing for the fixed-point iteration, x = g(x).
+    Each column of the states is mixed independently
+    using the differences of the last ``depth`` iterates.
+    """
+
+    def __init__(self, depth):
+        self._depth = depth
+        self._dF = []  # Differences of the residuals, f = g(x) - x.
+        self._dG = []  # Differences of g(x).
+        self._f = None
+        self._g = None
+
+    def mix(self, X, GX, cols=None):
+        """Return the mixed states from X and GX = g(X).
+        cols designates the columns of the full states given in X,
+        when only a part of the columns is updated.
+        """
+        if cols is None:
+            cols = np.arange(X.shape[1])
+
+        F = GX - X
+        if self._f is None:
+            self._f = np.zeros_like(F)
+            self._g = np.zeros_like(GX)
+        else:
+            dF = np.zeros_like(self._f)
+            dG = np.zeros_like(self._g)
+            dF[:, cols] = F - self._f[:, cols]
+            dG[:, cols] = GX - self._g[:, cols]
+            self._dF.append(dF)
+            self._dG.append(dG)
+            if len(self._dF) > self._depth:
+                self._dF.pop(0)
+                self._dG.pop(0)
+
+        self._f[:, cols] = F
+        self._g[:, cols] = GX
+
+        if not self._dF:
+            return GX
+
+        # Least squares of each column: min ||dF*gamma - F||
+        dF = np.stack([d[:, cols] for d in self._dF])
+        dG = np.stack([d[:, cols] for d in self._dG])
+        G = np.einsum('inc,jnc->cij', dF, dF)
+        r = np.einsum('inc,nc->ci', dF, F)
+        m = G.shape[1]
+        reg = 1e-10*np.trace(G, axis1=1, axis2=2)/m + 1e-300
+        G += reg[:, None, None]*np.eye(m)
+        try:
+            gamma = np.linalg.solve(G, r[:, :, None])[:, :, 0]
+        except np.linalg.LinAlgError:
+            return GX
+
+        return GX - np.einsum('inc,ci->nc', dG, gamma)
+# end of class _AndersonMixer
+
+
+class ReducedNetwork(object):
+    """The network reduced onto the kept nodes, K,
+    by eliminating the other nodes, E, exactly from
+    (I-aW)*x = (1-a)b through the Schur complement of A = (I-aW):
+
+        S = A_KK - A_KE*A_EE^-1*A_EK,
+        S*x_K = (1-a)b_K + f, where f = -(1-a)A_KE*A_EE^-1*b_E.
+
+    The link perturbations of the kept nodes, W' = diag(r)*W*diag(c),
+    are also exact in the reduced network:
+
+        S' = I + diag(r_K)*(S - I)*diag(c_K), f' = diag(r_K)*f.
+
+    Parameters
+    ----------
+    inds : numpy.ndarray
+        Sorted indices of the kept nodes in W.
+    S : numpy.ndarray
+        Schur complement of (I-aW) onto the kept nodes.
+    f : numpy.ndarray
+        Contribution of the basal activities of the eliminated nodes.
+    b_elim : numpy.ndarray
+        Basal activities of the eliminated nodes.
+    alpha : float
+        Hyperparameter of the reduced network.
+    W_hash : str, optional
+        Hash of the contents of W, ``sfa.algorithms.cache.hash_matrix(W)``.
+    """
+
+    def __init__(self, inds, S, f, b_elim, alpha, W_hash=None):
+        self.inds = np.asarray(inds, dtype=np.int64)
+        self.S = np.asarray(S, dtype=np.float64)
+        self.f = np.asarray(f, dtype=np.float64)
+        self.b_elim = np.asarray(b_elim, dtype=np.float64)
+        self.alpha = float(alpha)
+        self.W_hash = W_hash
+
+    @classmethod
+    def from_weight_matrix(cls, W, alpha, inds, b=None):
+        """Reduce (I-aW) onto the nodes of inds.
+
+        Parameters
+        ----------
+        W : numpy.ndarray or scipy.sparse.csr_matrix
+            Weight matrix.
+        alpha : float
+            Hyperparameter, a.
+        inds : list or numpy.ndarray
+            Indices of the nodes to be kept.
+        b : numpy.ndarray, optional
+            1D array of basal activity, which is zero if it is not given.
+
+        Returns
+        -------
+        reduced : sfa.algorithms.sp.ReducedNetwork
+        """
+        N = W.shape[0]
+        a = alpha
+        inds = np.unique(np.asarray(inds, dtype=np.int64))
+        inds_elim = np.setdiff1d(np.arange(N), inds)
+        if b is None:
+            b = np.zeros(N)
+
+        if sp.sparse.issparse(W):
+            A = (sp.sparse.identity(N, format='csr') - a*W).tocsr()
+            A_KK = A[inds][:, inds].toarray()
+            A_KE = A[inds][:, inds_elim]
+            A_EK = A[inds_elim][:, inds].toarray()
+            A_EE = A[inds_elim][:, inds_elim].tocsc()
+            try:
+                solve = sp.sparse.linalg.splu(A_EE).solve
+            except RuntimeError as err:  # Exactly singular
+                raise np.linalg.LinAlgError(str(err))
+        else:
+            A = np.eye(N) - a*W
+            A_KK = A[np.ix_(inds, inds)]
+            A_KE = A[np.ix_(inds, inds_elim)]
+            A_EK = A[np.ix_(inds_elim, inds)]
+            A_EE = A[np.ix_(inds_elim, inds_elim)]
+            lu, piv = sp.linalg.lu_factor(A_EE)
+            if np.any(np.diag(lu) == 0):
+                raise np.linalg.LinAlgError("Singular matrix")
+
+            def solve(Y):
+                return sp.linalg.lu_solve((lu, piv), Y)
+
+        b_elim = b[inds_elim]
+        if inds_elim.size > 0:
+            # A_EE^-1 * [A_EK, b_E] at once
+            Z = solve(np.column_stack([A_EK, b_elim]))
+            Y = A_KE.dot(Z)
+        else:
+            Y = np.zeros((inds.size, inds.size + 1))
+
+        S = A_KK - Y[:, :-1]
+        f = -(1-a)*Y[:, -1]
+        return cls(inds, S, f, b_elim, a)
+
+    @property
+    def nbytes(self):
+        return self.inds.nbytes + self.S.nbytes \
+               + self.f.nbytes + self.b_elim.nbytes
+
+    def solve(self, b, r=None, c=None):
+        """Solve the reduced network.
+
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activities of the kept nodes, or 2D array
+            whose columns are those of multiple conditions.
+        r : numpy.ndarray, optional
+            1D array of row scales of W at the kept nodes.
+        c : numpy.ndarray, optional
+            1D array of column scales of W at the kept nodes.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            The activities at steady-state of the kept nodes,
+            which has the same shape as b.
+        """
+        a = self.alpha
+        S = self.S
+        f = self.f
+        if r is not None:
+            I = np.eye(S.shape[0])
+            S = I + r[:, None]*(S - I)*c[None, :]
+            f = r*f
+
+        if b.ndim == 2:
+            f = f[:, None]
+
+        return np.linalg.solve(S, (1-a)*b + f)
+
+    def save(self, fpath):
+        """Save the reduced network in NumPy .npz format.
+        """
+        np.savez(fpath, inds=self.inds, S=self.S, f=self.f,
+                 b_elim=self.b_elim, alpha=self.alpha,
+                 W_hash=str(self.W_hash) if self.W_hash else '')
+
+    @classmethod
+    def load(cls, fpath):
+        """Load the reduced network saved by ``save()``.
+        """
+        with np.load(fpath) as npz:
+            W_hash = str(npz['W_hash'])
+            return cls(npz['inds'], npz['S'], npz['f'], npz['b_elim'],
+                       float(npz['alpha']), W_hash if W_hash else None)
+
+# end of class ReducedNetwork
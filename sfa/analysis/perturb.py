@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+import scipy as sp
+import scipy.sparse
 
+from sfa.algorithms import TrajectoryRecorder
+from sfa.base import PerturbationPlan
 
-def analyze_perturb(alg, data, targets, b=None, get_trj=False):
+
+def analyze_perturb(alg, data, targets, b=None, get_trj=False,
+                    trj_step=1, trj_nodes=None):
     """Perform signal flow analysis under perturbations.
 
     Parameters
@@ -22,6 +28,13 @@ def analyze_perturb(alg, data, targets, b=None, get_trj=False):
 
     get_trj : bool (optional)
         Decide to get the trajectory of activity change.
+
+    trj_step : int (optional)
+        Record every trj_step-th iteration of the trajectory.
+
+    trj_nodes : list (optional)
+        List of node names, whose activities are recorded
+        in the trajectory. All nodes are recorded if it is not given.
         
     Returns
     -------
@@ -30,7 +43,7 @@ def analyze_perturb(alg, data, targets, b=None, get_trj=False):
         as x2 - x1, where x is
         the a vector of activities at steady-state.
 
-    F : numpy.ndarray
+    F : numpy.ndarray or scipy.sparse.csr_matrix
         A matrix of signal flows.        
         It is usually calculated as W2*x1 - W1*x1,
         where W is weight matrix and
@@ -47,38 +60,53 @@ def analyze_perturb(alg, data, targets, b=None, get_trj=False):
     elif b.size != N:
         raise TypeError("The size of b should be equal to %d"%(N))
 
-    inds = []
-    vals = []
-    alg.apply_inputs(inds, vals)
+    plan = PerturbationPlan(data, [targets])
+    inds, vals = alg._get_basal_update(plan, None)
     b[inds] = vals
 
+    def create_recorder():
+        if not get_trj:
+            return False
+
+        nodes = None
+        if trj_nodes is not None:
+            nodes = [data.n2i[name] for name in trj_nodes]
+        # 1000 is the default lim_iter of propagate_iterative.
+        return TrajectoryRecorder(N, 1000, step=trj_step, nodes=nodes)
+
     W_ctrl = alg.W.copy()
     x_ctrl, trj_ctrl = alg.propagate_iterative(
                                 W_ctrl,
                                 b,
                                 b,
                                 alg.params.alpha,
-                                get_trj=get_trj)
+                                get_trj=create_recorder())
 
     if data.has_link_perturb:
         W_pert = W_ctrl.copy()
-        alg.apply_perturbations(targets, inds, vals, W_pert)
+        alg._perturb_weights(plan, 0, W_pert)
         alg.W = W_pert
     else:
         W_pert = W_ctrl
-        alg.apply_perturbations(targets, inds, vals)
 
+    inds, vals = alg._get_basal_update(plan, 0)
     b[inds] = vals
     x_pert, trj_pert = alg.propagate_iterative(
                                 W_pert,
                                 b,
                                 b,
                                 alg.params.alpha,
-                                get_trj=get_trj)
+                                get_trj=create_recorder())
 
     act_change = x_pert - x_ctrl
 
-    if data.has_link_perturb:
+    if sp.sparse.issparse(W_ctrl):  # Element-wise products in CSR format
+        if data.has_link_perturb:
+            F = W_pert.multiply(x_pert) - W_ctrl.multiply(x_ctrl)
+        else:
+            F = W_ctrl.multiply(act_change)
+        F = sp.sparse.csr_matrix(F)
+    elif data.has_link_perturb:
         F = W_pert*x_pert - W_ctrl*x_ctrl
     else:
         F = W_ctrl*act_change
@@ -7,11 +7,12 @@ if sys.version_info <= (2, 8):
 import abc
 import copy
 
+import numpy as np
 import pandas as pd
 import six
 import sfa.utils
 
-__all__ = ['Algorithm', 'Data', 'Result']
+__all__ = ['Algorithm', 'Data', 'PerturbationPlan', 'Result']
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -196,6 +197,7 @@ class Data(ContainerItem):
         self._names_ptb = None
         self._iadj_to_idf = None
         self._has_link_perturb = None
+        self._plan = None
 
     def initialize(self,
                    fpath,
@@ -203,13 +205,18 @@ class Data(ContainerItem):
                    fname_ptb="ptb.tsv",
                    fname_conds="conds.tsv",
                    fname_exp="exp.tsv",
-                   inputs={}):
-
+                   inputs={},
+                   sparse=False):
+        """Read the network, conditions, experimental results and
+           perturbations of the data in the directory of fpath.
+           The adjacency matrix is read in CSR format, if sparse is True,
+           so that its memory scales with the number of links.
+        """
         dpath = os.path.dirname(fpath)
         fpath_network = os.path.join(dpath, fname_network)
         fpath_ptb = os.path.join(dpath, fname_ptb)
 
-        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True)
+        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True, sparse=sparse)
         self._A = A
         self._n2i = n2i
         self._dg = dg
@@ -245,7 +252,7 @@ class Data(ContainerItem):
 
     # Read-only members
     @property
-    def A(self):  # Adjacency matrix (numpy.ndarray)
+    def A(self):  # Adjacency matrix (numpy.ndarray or CSR matrix)
         return self._A
 
     @property
@@ -323,13 +330,166 @@ class Data(ContainerItem):
             raise TypeError("has_link_perturb should be boolean.")
         self._has_link_perturb = val
 
+    @property
+    def plan(self):
+        """The object of ``sfa.base.PerturbationPlan``
+           compiled from ``names_ptb``.
+           It is compiled again, if names_ptb, df_ptb or inputs is changed,
+           including the modification of names_ptb or df_ptb in place.
+        """
+        plan = getattr(self, '_plan', None)
+        if plan is None or not plan.is_compiled_from(self, self._names_ptb):
+            plan = PerturbationPlan(self, self._names_ptb)
+            self._plan = plan
+        return plan
+
 # end of class Data
 
 
+class PerturbationPlan(object):
+    """Perturbation conditions compiled into arrays of indices and values,
+    which are applied without looking up the DataFrame of perturbations.
+
+    Parameters
+    ----------
+    data : sfa.base.Data
+        Data object that has the information of perturbations.
+    names_ptb : list of list of str, optional
+        Names of perturbation targets for each condition.
+
+    Attributes
+    ----------
+    inds_input, vals_input : numpy.ndarray
+        Indices and values of the input nodes.
+    inds_node, vals_node : list of numpy.ndarray
+        Indices and basal activities of node type perturbations
+        for each condition.
+    inds_link, vals_link : list of numpy.ndarray
+        Indices of the nodes whose outgoing links (columns of W) are scaled,
+        and the scales of link type perturbations for each condition.
+    inds_iso, vals_iso : list of numpy.ndarray
+        Indices of the nodes whose links (rows and columns of W) are scaled,
+        and the scales of isolation type perturbations for each condition.
+    """
+
+    def __init__(self, data, names_ptb=None):
+        n2i = data.n2i
+        self._names_ptb = self._get_names_contents(names_ptb)
+        self._inputs = dict(data.inputs) if data.inputs else {}
+        self._ptb = self._get_ptb_contents(data.df_ptb, copy=True)
+
+        self.inds_input = np.array([n2i[inp] for inp in self._inputs],
+                                   dtype=np.int64)
+        self.vals_input = np.array(list(self._inputs.values()),
+                                   dtype=np.float64)
+
+        if data.df_ptb is not None:
+            types_ptb = data.df_ptb["Type"].to_dict()
+            vals_ptb = data.df_ptb["Value"].to_dict()
+
+        self.inds_node, self.vals_node = [], []
+        self.inds_link, self.vals_link = [], []
+        self.inds_iso, self.vals_iso = [], []
+        for targets in (names_ptb or []):
+            compiled = {'node': ([], []),
+                        'link': ([], []),
+                        'isolation': ([], [])}
+            for target in targets:
+                if data.df_ptb is not None:
+                    type_ptb = types_ptb[target]
+                    val_ptb = vals_ptb[target]
+                else:
+                    type_ptb = 'node'
+                    val_ptb = -1
+
+                if type_ptb not in compiled:
+                    raise ValueError("Undefined perturbation type: %s"
+                                     % (type_ptb))
+                inds, vals = compiled[type_ptb]
+                inds.append(n2i[target])
+                vals.append(val_ptb)
+            # end of for
+
+            for type_ptb, list_inds, list_vals in (
+                    ('node', self.inds_node, self.vals_node),
+                    ('link', self.inds_link, self.vals_link),
+                    ('isolation', self.inds_iso, self.vals_iso)):
+                inds, vals = compiled[type_ptb]
+                list_inds.append(np.array(inds, dtype=np.int64))
+                list_vals.append(np.array(vals, dtype=np.float64))
+        # end of for
+
+    def __len__(self):
+        return len(self.inds_node)
+
+    @staticmethod
+    def _get_ptb_contents(df_ptb, copy=False):
+        """Get the targets, types and values of df_ptb as arrays.
+        """
+        if df_ptb is None:
+            return None
+
+        arrays = (df_ptb.index.values,
+                  df_ptb["Type"].values,
+                  df_ptb["Value"].values)
+        if copy:
+            arrays = tuple(arr.copy() for arr in arrays)
+        return arrays
+
+    @staticmethod
+    def _get_names_contents(names_ptb):
+        """Get the names of perturbation targets as a tuple of tuples.
+        """
+        if names_ptb is None:
+            return None
+        return tuple(map(tuple, names_ptb))
+
+    def is_compiled_from(self, data, names_ptb):
+        """Check whether this plan is compiled from
+           the current perturbations and inputs of data.
+           The contents of names_ptb and df_ptb are compared,
+           so that the plan is not reused after they are modified in place.
+        """
+        inputs = data.inputs if data.inputs else {}
+        if self._names_ptb != self._get_names_contents(names_ptb) \
+                or self._inputs != inputs:
+            return False
+
+        ptb = self._get_ptb_contents(data.df_ptb)
+        if ptb is None or self._ptb is None:
+            return ptb is self._ptb
+
+        return all(arr.shape == arr_old.shape
+                   and np.array_equal(arr, arr_old)
+                   for arr, arr_old in zip(ptb, self._ptb))
+
+    def has_link_perturb(self, i):
+        """Check whether the i-th condition has link or isolation
+           type perturbations.
+        """
+        return self.inds_link[i].size > 0 or self.inds_iso[i].size > 0
+
+    def has_any_link_perturb(self):
+        """Check whether any condition has link or isolation
+           type perturbations.
+        """
+        return any(self.has_link_perturb(i) for i in range(len(self)))
+
+    def get_targets(self, i):
+        """Get the sorted indices of all targets of the i-th condition.
+        """
+        return np.sort(np.concatenate([self.inds_node[i],
+                                       self.inds_link[i],
+                                       self.inds_iso[i]]))
+
+# end of class PerturbationPlan
+
+
 class Result(sfa.utils.FrozenClass):
 
     def __init__(self):
         self._df_sim = None
+        self._df_info = None
         self._freeze()
 
     @property
@@ -340,4 +500,16 @@ class Result(sfa.utils.FrozenClass):
     def df_sim(self, val):
         self._df_sim = val
 
+    @property
+    def df_info(self):
+        """Information of the solver for each condition
+           (e.g., the number of iterations and the residual),
+           if the solver reports it.
+        """
+        return self._df_info
+
+    @df_info.setter
+    def df_info(self, val):
+        self._df_info = val
+
 # end of def class Result
\ No newline at end of file
@@ -109,7 +109,7 @@ http://stackoverflow.com/questions/3387691/python-how-to-perfectly-override-a-di
 """
 # end of def class
 
-excluded = ['np.py']
+excluded = ['np.py', 'cache.py']
 
 @Singleton
 class AlgorithmSet(Container):
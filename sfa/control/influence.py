@@ -1,5 +1,10 @@
+import warnings
+
 import numpy as np
 import scipy as sp
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
 import pandas as pd
 
 
@@ -14,7 +19,12 @@ def calc_influence(W,
                    tol=1e-6,
                    get_iter=False,
                    device="cpu",
-                   sparse=False):
+                   sparse=False,
+                   method='iterative',
+                   get_cond=False,
+                   drop_tol=0.0,
+                   max_bytes=None,
+                   output_only=False):
     r"""Calculate the influence matrix.
        It estimates the effects of a node to the other nodes,
        by calculating partial derivative with respect to source nodes,
@@ -44,6 +54,22 @@ def calc_influence(W,
 
        The iteration continues until $||S(t+1) - S(t)|| \leq tol$.
 
+       The doubling method reaches the same truncation order
+       in O(log t) matrix products. With $P(t) = (\alpha W)^t$ and
+       $G(t) = I + \alpha W + ... + (\alpha W)^{t-1}$,
+
+        S(t) = S(0)P(t) + G(t),
+        G(2t) = G(t) + G(t)P(t), P(2t) = P(t)P(t).
+
+       The doubling continues until $||S(2t) - S(t)|| \leq tol$.
+
+       The exact method computes the limit of the series,
+
+        S = \beta(I - \alpha W)^{-1},
+
+       from a single LU factorization of $(I - \alpha W)$.
+       Only the rows of the outputs are computed for 'df' rtype.
+
 
     Parameters
     ----------
@@ -70,28 +96,90 @@ def calc_influence(W,
     device : str, optional, {'CPU', 'GPU:0', 'GPU:1', ...}
         Select which device to use. 'CPU' is default.
     sparse : bool, optional
-        Use sparse matrices for the computation.
+        Use sparse matrices (CSR format) for the iterative method.
+    method : str, optional, {'iterative', 'doubling', 'exact'}
+        'iterative' sums the series until the tolerance is met.
+        'doubling' doubles the truncation order of the series
+        until the tolerance is met on CPU, where max_iter limits
+        the truncation order.
+        'exact' solves the linear system with the LU factorization
+        on CPU, where S, max_iter and tol are not used.
+    get_cond : bool, optional
+        Determine whether the estimated condition number
+        of $(I - \alpha W)$ in 1-norm is returned.
+        It is available for the exact method.
+    drop_tol : float, optional
+        Entries whose magnitudes are smaller than drop_tol are dropped
+        after each iteration of the sparse iterative method,
+        which controls the fill-in of S.
+    max_bytes : int, optional
+        Memory budget of S in bytes for the sparse iterative method.
+        Only the largest entries in magnitude are kept
+        after each iteration if S exceeds the budget.
+        The tolerance may not be met, if the budget is too small
+        to keep the significant entries.
+    output_only : bool, optional
+        Compute only the rows of S for the outputs on CPU,
+        which requires outputs and n2i. The rows are obtained
+        by k transposed solves for the exact method,
+        or by the iterations of k vectors for the iterative method,
+        y(t+1) = \alpha W^T y(t) + e_i, instead of the whole matrix.
+        The 'array' rtype returns the rows in the order of outputs.
 
     Returns
     -------
     S : numpy.ndarray, optional
-        2D array of influence.
+        2D array of influence, or its rows of the outputs
+        if output_only is True.
     df : pd.DataFrame, optional
         Influences for each output in DataFrame.
     num_iter : int, optional
-        The actual number of iteration.
+        The actual number of iteration, which is the truncation order
+        for the doubling method and 0 for the exact method.
+    cond : float, optional
+        The estimated condition number of $(I - \alpha W)$ in 1-norm
+        (LAPACK gecon for dense W and onenormest for sparse W).
     """
     # TODO: Test rendering the above mathematical expressions in LaTeX form.
 
     if max_iter < 2:
         raise ValueError("max_iter should be greater than 2.")
 
+    if method not in ('iterative', 'doubling', 'exact'):
+        raise ValueError("Unknown method: %s" % (method))
+    elif get_cond and method != 'exact':
+        raise ValueError("get_cond is available for the exact method.")
+
     device = device.lower()
 
-    if 'cpu' in device:
+    rows = None  # Rows of S computed for the outputs
+    if output_only:
+        if not outputs or n2i is None:
+            raise ValueError("outputs and n2i should be designated "
+                             "for output_only.")
+        elif method == 'doubling':
+            raise ValueError("output_only is not available "
+                             "for the doubling method.")
+        rows = [n2i[trg] for trg in outputs]
+    elif method == 'exact' and rtype == 'df' and outputs:
+        rows = [n2i[trg] for trg in outputs]
+
+    if method == 'exact':
+        S_ret, cond = _calc_influence_exact(W, alpha, beta, rows)
+        ret = (S_ret, 0) if get_iter else S_ret
+        if get_cond:
+            ret = (ret if get_iter else (ret,)) + (cond,)
+    elif output_only:
+        ret = _calc_influence_rows(W, alpha, beta, rows, S,
+                                   max_iter, tol, get_iter)
+    elif method == 'doubling':
+        ret = _calc_influence_doubling(W, alpha, beta, S,
+                                       max_iter, tol, get_iter)
+    elif 'cpu' in device:
         if sparse:
             ret = _calc_influence_cpu_sparse(W, alpha, beta, S,
-                                               max_iter, tol, get_iter)
+                                             max_iter, tol, get_iter,
+                                             drop_tol, max_bytes)
         else:
             ret = _calc_influence_cpu(W, alpha, beta, S,
                                         max_iter, tol, get_iter)
@@ -100,7 +188,9 @@ def calc_influence(W,
         ret = _calc_influence_gpu(W, alpha, beta, S,
                                   max_iter, tol, get_iter, id_device)
 
-    if get_iter:
+    if method == 'exact':
+        num_iter = 0
+    elif get_iter:
         S_ret, num_iter = ret
     else:
         S_ret = ret
@@ -112,25 +202,164 @@ def calc_influence(W,
             err_msg = "outputs should be designated for 'df' return type."
             raise ValueError(err_msg)
 
-        df = pd.DataFrame(columns=outputs)
-
-        for trg in outputs:
-            for src in n2i:
-                if src == trg:
-                    df.loc[src, trg] = np.inf
-
-                idx_src = n2i[src]
-                idx_trg = n2i[trg]
-                df.loc[src, trg] = S_ret[idx_trg, idx_src]
+        df = _create_influence_df(S_ret, outputs, n2i, rows is not None)
 
+        ret = (df,)
         if get_iter:
-            return df, num_iter
-        else:
-            return df
+            ret += (num_iter,)
+        if get_cond:
+            ret += (cond,)
+
+        return ret if len(ret) > 1 else df
     else:
         raise ValueError("Unknown return type: %s"%(rtype))
 
 
+def _create_influence_df(S, outputs, n2i, has_output_rows=False):
+    """Create the DataFrame of the influences of the nodes in n2i (index)
+       on the outputs (columns) by a single slice of S.
+       The self-influence of an output is the diagonal element of S.
+       The rows of S are the outputs, if has_output_rows is True.
+    """
+    outputs = list(outputs)
+    sources = list(n2i)
+    if has_output_rows:
+        idx_trg = np.arange(len(outputs))
+    else:
+        idx_trg = np.array([n2i[trg] for trg in outputs], dtype=np.int64)
+    idx_src = np.array([n2i[src] for src in sources], dtype=np.int64)
+
+    S_sub = S[idx_trg][:, idx_src]
+    if sp.sparse.issparse(S_sub):
+        S_sub = S_sub.toarray()
+    elif not isinstance(S_sub, np.ndarray):  # CuPy array
+        S_sub = S_sub.get()
+
+    return pd.DataFrame(S_sub.T, index=sources, columns=outputs)
+
+
+def _calc_influence_exact(W, alpha=0.5, beta=0.5, rows=None):
+    """Calculate beta*(I - alpha*W)^-1, or only its rows,
+       with the LU factorization, and estimate the condition number
+       of (I - alpha*W) in 1-norm.
+    """
+    N = W.shape[0]
+    if rows is None:
+        E = np.eye(N)
+    else:
+        E = np.zeros((N, len(rows)))
+        E[rows, np.arange(len(rows))] = 1
+
+    if sp.sparse.issparse(W):
+        M = sp.sparse.csc_matrix(sp.sparse.eye(N) - alpha*W)
+        try:
+            lu = sp.sparse.linalg.splu(M)
+        except RuntimeError as err:  # Exactly singular
+            raise np.linalg.LinAlgError(str(err))
+
+        # The i-th row of the inverse is the solution of M^T*z = e_i.
+        S = lu.solve(E, trans='T' if rows is not None else 'N')
+        inv = sp.sparse.linalg.LinearOperator((N, N),
+                                              matvec=lu.solve,
+                                              rmatvec=lambda x:
+                                              lu.solve(x, trans='T'))
+        norm_inv = sp.sparse.linalg.onenormest(inv)
+        cond = sp.sparse.linalg.norm(M, 1) * norm_inv
+    else:
+        M = np.eye(N) - alpha*W
+        with warnings.catch_warnings():
+            # Singularity is reported as LinAlgError below.
+            warnings.simplefilter("ignore")
+            lu, piv = sp.linalg.lu_factor(M)
+
+        if np.any(np.diag(lu) == 0):
+            raise np.linalg.LinAlgError("Singular matrix")
+
+        S = sp.linalg.lu_solve((lu, piv), E, trans=int(rows is not None))
+        gecon, = sp.linalg.get_lapack_funcs(('gecon',), (lu,))
+        rcond, _ = gecon(lu, np.linalg.norm(M, 1), norm='1')
+        cond = np.inf if rcond == 0 else 1.0 / rcond
+
+    if rows is not None:
+        S = S.T
+
+    return beta*S, cond
+
+
+def _calc_influence_rows(W, alpha=0.5, beta=0.5, rows=None, S=None,
+                         max_iter=1000, tol=1e-6, get_iter=False):
+    r"""Calculate the rows of S by the iterations of the vectors,
+       which are the columns of Y = S[rows, :]^T:
+
+       Y(t+1) = \alpha W^T Y(t) + E, where E = I[:, rows].
+    """
+    N = W.shape[0]
+    E = np.zeros((N, len(rows)))
+    E[rows, np.arange(len(rows))] = 1
+
+    if S is not None:
+        Y1 = S[rows].T
+        if sp.sparse.issparse(Y1):
+            Y1 = Y1.toarray()
+        Y1 = np.array(Y1, dtype=np.float64)
+    else:
+        Y1 = E.copy()
+
+    if sp.sparse.issparse(W):
+        aWT = sp.sparse.csr_matrix((alpha * W).T)
+    else:
+        aWT = np.ascontiguousarray(alpha * np.asarray(W).T)
+
+    for cnt in range(max_iter):
+        Y2 = aWT.dot(Y1) + E
+        norm = np.linalg.norm(Y2 - Y1)
+        if norm < tol:
+            break
+        # end of if
+        Y1 = Y2
+    # end of for
+
+    S_fin = beta * Y2.T
+    if get_iter:
+        return S_fin, cnt
+    else:
+        return S_fin
+
+
+def _calc_influence_doubling(W, alpha=0.5, beta=0.5, S=None,
+                             max_iter=1000, tol=1e-6, get_iter=False):
+    N = W.shape[0]
+    if sp.sparse.issparse(W):
+        P = sp.sparse.csr_matrix(alpha * W)  # P(1) = aW
+        G = sp.sparse.eye(N, dtype=np.float64, format='csr')  # G(1) = I
+        norm = sp.sparse.linalg.norm
+    else:
+        P = alpha * np.asarray(W, dtype=np.float64)
+        G = np.eye(N, dtype=np.float64)
+        norm = np.linalg.norm
+
+    S0 = S if S is not None else G.copy()
+    S1 = S0.dot(P) + G  # S(1)
+    order = 1
+    while 2*order <= max_iter:
+        G = G + G.dot(P)
+        P = P.dot(P)
+        S2 = S0.dot(P) + G  # S(2t)
+        order *= 2
+
+        converged = norm(S2 - S1) < tol
+        S1 = S2
+        if converged:
+            break
+    # end of while
+
+    S_fin = beta * S1
+    if get_iter:
+        return S_fin, order
+    else:
+        return S_fin
+
+
 def _calc_influence_cpu(W, alpha=0.5, beta=0.5, S=None,
                         max_iter=1000, tol=1e-6, get_iter=False):
     N = W.shape[0]
@@ -158,25 +387,31 @@ def _calc_influence_cpu(W, alpha=0.5, beta=0.5, S=None,
         return S_fin
 
 
-def _calc_influence_cpu_sparse(W, alpha, beta, S,
-                               max_iter, tol, get_iter):
+def _calc_influence_cpu_sparse(W, alpha=0.5, beta=0.5, S=None,
+                               max_iter=1000, tol=1e-6, get_iter=False,
+                               drop_tol=0.0, max_bytes=None):
     N = W.shape[0]
+    I = sp.sparse.eye(N, dtype=np.float64, format='csr')
     if S is not None:
-        S1 = S
+        S1 = sp.sparse.csr_matrix(S, dtype=np.float64)
     else:
-        S1 = sp.sparse.lil_matrix(sp.sparse.eye(N, dtype=np.float))
+        S1 = I.copy()
 
+    max_nnz = None
+    if max_bytes is not None:
+        # Size of an entry in CSR format: the value and the column index
+        max_nnz = max(int(max_bytes) // (8 + 4), N)
 
-    I = sp.sparse.eye(N, dtype=np.float)
-    S2 = sp.sparse.lil_matrix((N,N), dtype=np.float)
-    aW = sp.sparse.csc_matrix(alpha * W)
+    aW = sp.sparse.csr_matrix(alpha * W, dtype=np.float64)
     for cnt in range(max_iter):
-        S2[:, :] = S1.dot(aW) + I
+        S2 = S1.dot(aW) + I
+        # The threshold is not decreased for the convergence.
+        drop_tol = _sparsify(S2, drop_tol, max_nnz)
         norm = sp.sparse.linalg.norm(S2 - S1)
         if norm < tol:
             break
         # end of if
-        S1[:, :] = S2
+        S1 = S2
     # end of for
 
     S_fin = beta * S2
@@ -186,6 +421,25 @@ def _calc_influence_cpu_sparse(W, alpha, beta, S,
         return S_fin
 
 
+def _sparsify(S, drop_tol=0.0, max_nnz=None):
+    """Drop the entries of a CSR matrix in place,
+       whose magnitudes are smaller than drop_tol,
+       or which are not the max_nnz largest entries in magnitude.
+       The threshold of the magnitude is returned.
+    """
+    mag = np.abs(S.data)
+    if max_nnz is not None and np.count_nonzero(mag >= drop_tol) > max_nnz:
+        # Magnitude of the max_nnz-th largest entry
+        drop_tol = np.partition(mag, S.nnz - max_nnz)[S.nnz - max_nnz]
+
+    dropped = mag < drop_tol
+    if dropped.any():
+        S.data[dropped] = 0
+        S.eliminate_zeros()
+
+    return drop_tol
+
+
 def _calc_influence_gpu(W, alpha=0.5, beta=0.5, S=None,
                         max_iter=1000, tol=1e-6, get_iter=False,
                         id_device=0):    
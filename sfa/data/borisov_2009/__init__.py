@@ -30,7 +30,7 @@ import sfa
 import sfa.base
 
 
-def create_data(abbr=None):
+def create_data(abbr=None, sparse=False):
     if abbr is None:  # Create all data objects
         data_mult = {}  # Multiple data
         dpath = os.path.dirname(__file__)
@@ -38,14 +38,14 @@ def create_data(abbr=None):
         fstr_file = os.path.join(dpath, 'exp_data', 'exp_*')
         for abspath in glob.glob(fstr_file):
             fname = os.path.basename(abspath)
-            data_obj = _create_single_data(abbr, fname=fname)
+            data_obj = _create_single_data(abbr, fname=fname, sparse=sparse)
             data_mult[data_obj.abbr] = data_obj
 
         # end of for
 
         return data_mult
     else:  # Create a single data object
-        return _create_single_data(abbr)
+        return _create_single_data(abbr, sparse=sparse)
 
 # end of def
 
@@ -101,7 +101,7 @@ def create_test_data():
 
 
 
-def _create_single_data(abbr=None, fname=None):
+def _create_single_data(abbr=None, fname=None, sparse=False):
     dpath = os.path.dirname(__file__)
 
     if fname:
@@ -152,7 +152,7 @@ def _create_single_data(abbr=None, fname=None):
 
     return BorisovData(abbr, data_type,
                        conc_EGF, conc_I,
-                       fname_conds, fname_exp)
+                       fname_conds, fname_exp, sparse)
 
     # str_exp_file = os.path.join(dpath, 'exp_data', fname)
     # df_exp = pd.read_table(str_exp_file,
@@ -172,7 +172,8 @@ class BorisovData(sfa.base.Data):
                  abbr,
                  data_type,
                  conc_EGF, conc_I,
-                 fname_conds, fname_exp):
+                 fname_conds, fname_exp,
+                 sparse=False):
 
         super().__init__()
         self._abbr = abbr
@@ -187,7 +188,8 @@ class BorisovData(sfa.base.Data):
         self.initialize(__file__,
                         inputs=inputs,
                         fname_conds=fname_conds,
-                        fname_exp=fname_exp)
+                        fname_exp=fname_exp,
+                        sparse=sparse)
 
     # end of def __init__
 # end of def class BorisovData
\ No newline at end of file
@@ -15,13 +15,13 @@ import sfa
 import sfa.base
 
 
-def create_data():
-    return FlobakData()
+def create_data(sparse=False):
+    return FlobakData(sparse)
 
 
 class FlobakData(sfa.base.Data):
 
-    def __init__(self):
+    def __init__(self, sparse=False):
 
         self._abbr = "flobak_2015"
         self._name = "Flobak et al. PLoS Comput Biol, (2015) 11(8)"
@@ -29,7 +29,7 @@ class FlobakData(sfa.base.Data):
 
         dpath = os.path.dirname(__file__)
         fpath_network = os.path.join(dpath, 'network.sif')
-        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True)
+        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True, sparse=sparse)
         self._A = A
         self._n2i = n2i
         self._i2n = {idx: name for name, idx in n2i.items()}
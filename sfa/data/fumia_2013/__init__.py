@@ -17,13 +17,13 @@ import sfa
 import sfa.base
 
 
-def create_data():
-    return FumiaData()
+def create_data(sparse=False):
+    return FumiaData(sparse)
 
 
 class FumiaData(sfa.base.Data):
 
-    def __init__(self):
+    def __init__(self, sparse=False):
 
         self._abbr = "fumia_2013"
         self._name = "Fumiã et al. PLoS ONE, (2013) 8(7), e69008"
@@ -36,7 +36,7 @@ class FumiaData(sfa.base.Data):
 
         dpath = os.path.dirname(__file__)
         fpath_network = os.path.join(dpath, 'network.sif')
-        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True)
+        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True, sparse=sparse)
         self._A = A
         self._n2i = n2i
         self._i2n = {idx: name for name, idx in n2i.items()}
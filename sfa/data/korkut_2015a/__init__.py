@@ -16,22 +16,22 @@ import pandas as pd
 import sfa
 import sfa.base
 
-def create_data():
+def create_data(sparse=False):
     dpath = os.path.dirname(__file__)
     fpath_network = os.path.join(dpath, "model_3250.sif")
-    return KorkutData("KORKUT_2015A", dpath, fpath_network)
+    return KorkutData("KORKUT_2015A", dpath, fpath_network, sparse)
 
 
 class KorkutData(sfa.base.Data):
 
-    def __init__(self, abbr, dpath, fpath_network):
+    def __init__(self, abbr, dpath, fpath_network, sparse=False):
 
         self._abbr = abbr
         self._name = "Korkut and Wang et al. eLife 2015;4:e04640"
 
         fpath_ptb = os.path.join(dpath, "ptb.tsv")
 
-        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True)
+        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True, sparse=sparse)
         self._A = A
         self._n2i = n2i
         self._dg = dg
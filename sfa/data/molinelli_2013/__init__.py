@@ -16,18 +16,18 @@ import pandas as pd
 import sfa
 import sfa.base
 
-def create_data():
-    return MolinelliData()
+def create_data(sparse=False):
+    return MolinelliData(sparse)
 
 
 class MolinelliData(sfa.base.Data):
 
-    def __init__(self):
+    def __init__(self, sparse=False):
 
         self._abbr = "MOLINELLI_2013"
         self._name = "Molinell et al. 2013 PLoS Comput Biol 9(12): e1003290"
 
-        self.initialize(__file__)
+        self.initialize(__file__, sparse=sparse)
 
     # end of def __init__
 
@@ -15,19 +15,19 @@ import pandas as pd
 import sfa
 import sfa.base
 
-def create_data():
-    return NelenderData()
+def create_data(sparse=False):
+    return NelenderData(sparse)
 
 
 class NelenderData(sfa.base.Data):
 
-    def __init__(self):
+    def __init__(self, sparse=False):
 
         self._abbr = "NELANDER_2008"
         self._name = "Nelander et al. 2008 Mol Sys Biol (2008) 4(1), 216"
         inputs = {}
         inputs['EGF'] = 1.0
-        self.initialize(__file__, inputs=inputs)
+        self.initialize(__file__, inputs=inputs, sparse=sparse)
     # end of def __init__
 
 
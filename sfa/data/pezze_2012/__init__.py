@@ -31,7 +31,7 @@ import sfa
 import sfa.base
 
 
-def create_data(abbr=None):
+def create_data(abbr=None, sparse=False):
     if abbr is None:  # Create all data objects
         data_mult = {}  # Multiple data
         dpath = os.path.dirname(__file__)
@@ -39,18 +39,18 @@ def create_data(abbr=None):
         fstr_file = os.path.join(dpath, 'exp_data', '*.tsv')
         for abspath in glob.glob(fstr_file):
             fname = os.path.basename(abspath)
-            data_obj = _create_single_data(abbr, fname=fname)
+            data_obj = _create_single_data(abbr, fname=fname, sparse=sparse)
             data_mult[data_obj.abbr] = data_obj
 
         # end of for
 
         return data_mult
     else:  # Create a single data object
-        return _create_single_data(abbr)
+        return _create_single_data(abbr, sparse=sparse)
 
 # end of def
 
-def _create_single_data(abbr=None, fname=None):
+def _create_single_data(abbr=None, fname=None, sparse=False):
     dpath = os.path.dirname(__file__)
 
     if fname:
@@ -88,12 +88,13 @@ def _create_single_data(abbr=None, fname=None):
 
     return PezzeData(abbr, data_type,
                      conc_I,
-                     fname_conds, fname_exp)
+                     fname_conds, fname_exp, sparse)
 # end of def
 
 
 class PezzeData(sfa.base.Data):
-    def __init__(self, abbr, data_type, conc_I, fname_conds, fname_exp):
+    def __init__(self, abbr, data_type, conc_I, fname_conds, fname_exp,
+                 sparse=False):
         super().__init__()
         self._abbr = abbr
         fstr_name = "PEZZE_2011_%s[I=%snM]"
@@ -106,7 +107,8 @@ class PezzeData(sfa.base.Data):
         self.initialize(__file__,
                    inputs=inputs,
                    fname_conds=fname_conds,
-                   fname_exp=fname_exp)
+                   fname_exp=fname_exp,
+                   sparse=sparse)
 
     # end of def __init__
 # end of def class
\ No newline at end of file
@@ -29,7 +29,7 @@ import sfa
 import sfa.base
 
 
-def create_data(abbr=None):
+def create_data(abbr=None, sparse=False):
     if abbr is None:  # Create all data objects
         data_mult = {}  # Multiple data
         dpath = os.path.dirname(__file__)
@@ -37,18 +37,18 @@ def create_data(abbr=None):
         fstr_file = os.path.join(dpath, 'exp_data', 'exp_*')
         for abspath in glob.glob(fstr_file):
             fname = os.path.basename(abspath)
-            data_obj = _create_single_data(abbr, fname=fname)
+            data_obj = _create_single_data(abbr, fname=fname, sparse=sparse)
             data_mult[data_obj.abbr] = data_obj
 
         # end of for
 
         return data_mult
     else:  # Create a single data object
-        return _create_single_data(abbr)
+        return _create_single_data(abbr, sparse=sparse)
 
 # end of def
 
-def _create_single_data(abbr=None, fname=None):
+def _create_single_data(abbr=None, fname=None, sparse=False):
     dpath = os.path.dirname(__file__)
 
     if fname:
@@ -86,7 +86,7 @@ def _create_single_data(abbr=None, fname=None):
 
     return SchliemannData(abbr, data_type,
                           conc_I,
-                          fname_conds, fname_exp)
+                          fname_conds, fname_exp, sparse)
 
 
 # end of def
@@ -97,7 +97,8 @@ class SchliemannData(sfa.base.Data):
                  abbr,
                  data_type,
                  conc_I,
-                 fname_conds, fname_exp):
+                 fname_conds, fname_exp,
+                 sparse=False):
 
         super().__init__()
         self._abbr = abbr
@@ -113,6 +114,7 @@ class SchliemannData(sfa.base.Data):
         self.initialize(__file__,
                         inputs=inputs,
                         fname_conds=fname_conds,
-                        fname_exp=fname_exp)
+                        fname_exp=fname_exp,
+                        sparse=sparse)
     # end of def __init__
 # end of def class
\ No newline at end of file
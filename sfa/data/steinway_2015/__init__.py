@@ -27,13 +27,13 @@ import sfa
 import sfa.base
 
 
-def create_data():
-    return SteinwayData()
+def create_data(sparse=False):
+    return SteinwayData(sparse)
 
 
 class SteinwayData(sfa.base.Data):
 
-    def __init__(self):
+    def __init__(self, sparse=False):
 
         self._abbr = "steinway_2015"
         self._name = "Steinway et al. Npj Syst Biol Appl (2015)  1(1), 15014"
@@ -42,7 +42,7 @@ class SteinwayData(sfa.base.Data):
 
         dpath = os.path.dirname(__file__)
         fpath_network = os.path.join(dpath, 'network.sif')
-        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True)
+        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True, sparse=sparse)
         self._A = A
         self._n2i = n2i
         self._i2n = {idx: name for name, idx in n2i.items()}
@@ -16,13 +16,13 @@ import sfa
 import sfa.base
 
 
-def create_data():
-    return ZanudoAData()
+def create_data(sparse=False):
+    return ZanudoAData(sparse)
 
 
 class ZanudoAData(sfa.base.Data):
 
-    def __init__(self):
+    def __init__(self, sparse=False):
 
         self._abbr = "zanudo_2015a"
         self._name = "Zañudo et al. PLoS Computational Biology, 11(4), e1004193"
@@ -30,7 +30,7 @@ class ZanudoAData(sfa.base.Data):
 
         dpath = os.path.dirname(__file__)
         fpath_network = os.path.join(dpath, 'network.sif')
-        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True)
+        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True, sparse=sparse)
         self._A = A
         self._n2i = n2i
         self._i2n = {idx: name for name, idx in n2i.items()}
@@ -4,6 +4,8 @@ import codecs
 from collections import defaultdict
 
 import numpy as np
+import scipy as sp
+import scipy.sparse
 import networkx as nx
 
 from .base import Data
@@ -29,7 +31,8 @@ def read_inputs(fpath):
     return inputs
 
 
-def read_sif(fpath, str_act='+', str_inh='-', sort=True, as_nx=False):
+def read_sif(fpath, str_act='+', str_inh='-', sort=True, as_nx=False,
+             sparse=False):
     dict_links = defaultdict(list)
     set_nodes = set()
     name_to_idx = {}
@@ -61,18 +64,33 @@ def read_sif(fpath, str_act='+', str_inh='-', sort=True, as_nx=False):
         list_nodes = list(set_nodes)
 
     N = len(set_nodes)
-    adj = np.zeros((N, N), dtype=np.int)
 
     for isrc, name in enumerate(list_nodes):
         name_to_idx[name] = isrc  # index of source
     # end of for
-    for name_src in name_to_idx:
-        isrc = name_to_idx[name_src]
-        for name_tgt, sign in dict_links[name_src]:
-            itgt = name_to_idx[name_tgt]
-            adj[itgt, isrc] = sign
-            # end of for
-    # end of for
+
+    if sparse:  # Adjacency matrix in CSR format
+        entries = {}  # The last sign of a duplicated link is kept.
+        for name_src in name_to_idx:
+            isrc = name_to_idx[name_src]
+            for name_tgt, sign in dict_links[name_src]:
+                itgt = name_to_idx[name_tgt]
+                entries[(itgt, isrc)] = sign
+        # end of for
+        ir = [itgt for itgt, _ in entries]
+        ic = [isrc for _, isrc in entries]
+        signs = list(entries.values())
+        adj = sp.sparse.csr_matrix((signs, (ir, ic)), shape=(N, N),
+                                   dtype=np.int64)
+    else:
+        adj = np.zeros((N, N), dtype=np.int)
+        for name_src in name_to_idx:
+            isrc = name_to_idx[name_src]
+            for name_tgt, sign in dict_links[name_src]:
+                itgt = name_to_idx[name_tgt]
+                adj[itgt, isrc] = sign
+                # end of for
+        # end of for
 
     if not as_nx:
         return adj, name_to_idx
@@ -96,7 +114,8 @@ def read_sif(fpath, str_act='+', str_inh='-', sort=True, as_nx=False):
 # end of def
 
 
-def create_from_sif(fpath, abbr=None, inputs=None, outputs=None):
+def create_from_sif(fpath, abbr=None, inputs=None, outputs=None,
+                    sparse=False):
     """Create sfv.base.Data object from SIF file.
 
     Parameters
@@ -109,6 +128,9 @@ def create_from_sif(fpath, abbr=None, inputs=None, outputs=None):
         Input information with default values
     outputs : sequence, optional
         Output information.
+    sparse : bool, optional
+        Read the adjacency matrix in CSR format,
+        whose memory scales with the number of links.
 
     Returns
     -------
@@ -124,7 +146,7 @@ def create_from_sif(fpath, abbr=None, inputs=None, outputs=None):
                 self._abbr = os.path.basename(fpath)
 
             self._name = self._abbr
-            A, n2i, dg = read_sif(fpath, as_nx=True)
+            A, n2i, dg = read_sif(fpath, as_nx=True, sparse=sparse)
             self._A = A
             self._n2i = n2i
             self._i2n = {idx: name for name, idx in n2i.items()}
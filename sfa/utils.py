@@ -9,6 +9,7 @@ from collections import defaultdict
 
 import numpy as np
 import scipy as sp
+import scipy.sparse
 import pandas as pd
 import networkx as nx
 
@@ -88,6 +89,9 @@ def normalize(A, norm_in=True, norm_out=True):
         raise ValueError(
             "The A (adjacency matrix) should be square matrix.")
 
+    if sp.sparse.issparse(A):
+        return _normalize_sparse(A, norm_in, norm_out)
+
     # Build propagation matrix (aka. transition matrix) _W from A
     W = A.copy()
 
@@ -125,6 +129,38 @@ def normalize(A, norm_in=True, norm_out=True):
 
 # end of def normalize
 
+def _normalize_sparse(A, norm_in=True, norm_out=True):
+    """The same as normalize() for a sparse A,
+    which returns the normalized matrix in CSR format.
+    """
+    A = sp.sparse.csr_matrix(A, dtype=np.float64)
+    abs_A = abs(A)
+    Dc = np.ones(A.shape[1])
+    Dr = np.ones(A.shape[0])
+
+    # Norm. out-degree
+    if norm_out == True:
+        sum_col_A = np.asarray(abs_A.sum(axis=0)).ravel()
+        sum_col_A[sum_col_A == 0] = 1
+        if norm_in == False:
+            Dc = 1 / sum_col_A
+        else:
+            Dc = 1 / np.sqrt(sum_col_A)
+
+    # Norm. in-degree
+    if norm_in == True:
+        sum_row_A = np.asarray(abs_A.sum(axis=1)).ravel()
+        sum_row_A[sum_row_A == 0] = 1
+        if norm_out == False:
+            Dr = 1 / sum_row_A
+        else:
+            Dr = 1 / np.sqrt(sum_row_A)
+
+    W = sp.sparse.diags(Dr).dot(A).dot(sp.sparse.diags(Dc))
+    return sp.sparse.csr_matrix(W)
+
+# end of def _normalize_sparse
+
 def rand_swap(A, nsamp=10, noself=True, inplace=False):
     """Randomly rewire the network connections by swapping.
 